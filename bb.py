@@ -1,27 +1,27 @@
+import hashlib
+import heapq
+import itertools
 import math
+import multiprocessing
+import multiprocessing.connection
 import random
 import time
-import networkx as nx
-import matplotlib.pyplot as plt
+import numpy as np
 import os
-import pandas as pd
+import warnings
 
-from typing import Dict, Set, List, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Set, List, NamedTuple, Optional, Tuple, Union
 
-from scipy.stats import false_discovery_control
+# networkx, matplotlib, pandas e scipy são importados na primeira chamada das funções que os usam
+# (plotar_grafico, exportar_excel, formulacao_drt, RelaxacaoLP, resolver_milp): importar bb para uma
+# busca, um processo trabalhador ou o benchmark não paga o custo dessas bibliotecas.
+if TYPE_CHECKING:
+    from scipy import sparse
 
-# from turtle import pd
-
-# Variáveis Globais para armazenar a Melhor Solução Encontrada (Upper Bound)
-# Estas variáveis são modificadas durante a execução recursiva do B&B.
-global BEST_WEIGHT
-BEST_WEIGHT = float('inf')  # Inicializado com peso infinito
-global BEST_STATES
-BEST_STATES = None  # Inicializado sem solução
-global RESULTADOS
+# Valores padrão do módulo. O incumbente (melhor peso e estados) pertence a cada Solver;
+# RESULTADOS é a lista usada pelas funções de módulo (dominacao, exportar_excel, executar_lote).
 RESULTADOS: List[Tuple[str, bool, bool, str, int, float]] = []
 # List[Tuple[técnica, nome_grafo, peso, tempo]]
-global BRANCHING_ORDER
 BRANCHING_ORDER = [0, 1, 2]  # Heurística de ramificação: Prioriza atribuições mais promissoras (2, depois 1, depois 0)
 
 
@@ -29,6 +29,60 @@ BRANCHING_ORDER = [0, 1, 2]  # Heurística de ramificação: Prioriza atribuiç
 # FUNÇÃO PARA VISUALIZAÇÃO DE GRAFOS
 # ======================================================================
 
+# Versão do formato do cache de layout de layout_grafo (incrementar se o conteúdo mudar)
+VERSAO_LAYOUT = 1
+
+
+def assinatura_layout(nx_graph) -> str:
+    """
+    Resumo (sha1) do que determina nx.spring_layout com semente fixa: a ordem dos vértices
+    (posições iniciais e matriz de adjacência seguem essa ordem) e o conjunto de arestas.
+    """
+    nos = list(nx_graph.nodes())
+    indice = {u: i for i, u in enumerate(nos)}
+    arestas = sorted(tuple(sorted((indice[u], indice[v]))) for u, v in nx_graph.edges())
+    resumo = hashlib.sha1(repr(nos).encode())
+    resumo.update(np.array(arestas, dtype=np.int64).tobytes())
+    return resumo.hexdigest()
+
+
+def layout_grafo(nx_graph, caminho: str) -> Dict:
+    """
+    nx.spring_layout(nx_graph, seed=42) com cache em 'caminho' (.npz): o layout de um grafo é
+    calculado uma única vez e reaproveitado nas imagens de todas as técnicas, inclusive por outros
+    processos. O cache só vale para o mesmo grafo (assinatura_layout); as posições são gravadas
+    em float64, então a imagem é idêntica à do layout recalculado.
+    """
+    import networkx as nx
+
+    assinatura = assinatura_layout(nx_graph)
+    try:
+        with np.load(caminho, allow_pickle=False) as dados:
+            if int(dados['versao']) == VERSAO_LAYOUT and str(dados['assinatura']) == assinatura:
+                return dict(zip(dados['nos'].tolist(), dados['posicoes']))
+    except FileNotFoundError:
+        pass
+    except Exception:
+        pass  # Cache corrompido ou ilegível: o layout é recalculado
+
+    pos = nx.spring_layout(nx_graph, seed=42)
+
+    nos = list(pos)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    try:
+        with open(temporario, 'wb') as f:
+            np.savez(f, versao=VERSAO_LAYOUT, assinatura=assinatura, nos=np.array(nos, dtype=np.int64),
+                     posicoes=np.array([pos[u] for u in nos], dtype=np.float64).reshape(-1, 2))
+        os.replace(temporario, caminho)
+    except OSError:
+        try:
+            os.remove(temporario)
+        except OSError:
+            pass
+
+    return pos
+
+
 def plotar_grafico(G: Dict[int, Set[int]], states: List[Optional[int]], peso: int, arquivo: str, tecnica: str,
                    is_lower_bound: bool, is_upper_bound: bool, pasta: str):
     """
@@ -42,6 +96,8 @@ def plotar_grafico(G: Dict[int, Set[int]], states: List[Optional[int]], peso: in
     - 'V{id}={peso}' para Peso 1 ou 2.
     A cor da fonte é preta para todos os rótulos.
 
+    O layout do grafo fica em cache na pasta das imagens (layout_grafo), compartilhado pelas técnicas.
+
     Args:
         G (Dict[int, Set[int]]): O grafo no formato de lista de adjacência (0-indexado).
         states (List[Optional[int]]): Lista de pesos (0, 1, 2) para cada vértice (0-indexado).
@@ -69,6 +125,10 @@ def plotar_grafico(G: Dict[int, Set[int]], states: List[Optional[int]], peso: in
         graph_name = os.path.basename(arquivo).replace(".txt", f" {tecnica}.png")
 
     filename = os.path.join(output_dir, graph_name)
+    caminho_layout = os.path.join(output_dir, os.path.splitext(os.path.basename(arquivo))[0] + '.layout.npz')
+
+    import matplotlib.pyplot as plt
+    import networkx as nx
 
     # 1. Conversão e Inicialização
     nx_graph = nx.Graph()
@@ -103,8 +163,8 @@ def plotar_grafico(G: Dict[int, Set[int]], states: List[Optional[int]], peso: in
 
     # 3. Desenho do Grafo
     plt.figure(figsize=(12, 10))
-    # Usa Spring Layout para posicionamento visualmente agradável
-    pos = nx.spring_layout(nx_graph, seed=42)
+    # Usa Spring Layout para posicionamento visualmente agradável (calculado uma vez por grafo)
+    pos = layout_grafo(nx_graph, caminho_layout)
 
     # Obtém a lista de cores na ORDEM correta dos nós do networkx (robustez contra desalinhamento)
     ordered_node_colors = [node_color_map.get(node_id) for node_id in nx_nodes]
@@ -137,6 +197,45 @@ def plotar_grafico(G: Dict[int, Set[int]], states: List[Optional[int]], peso: in
     # print(f"Grafo salvo em: {filename}")
 
 
+class FilaPlotagem:
+    """
+    Pool de processos que gera as imagens de plotar_grafico fora do caminho da busca.
+
+    enviar recebe os mesmos argumentos de plotar_grafico e retorna logo, então pode ser passado
+    como Solver(plotagem=fila.enviar) no processo que criou a fila. aguardar espera as imagens
+    pendentes e encerra o pool (também chamado ao sair do bloco with).
+
+    Com um único processo (padrão) as imagens não competem com a busca por mais de uma CPU, e as
+    técnicas de um mesmo grafo, enviadas em sequência, reaproveitam o layout do cache (layout_grafo).
+    """
+
+    def __init__(self, n_processos: int = 1):
+        self.pool = multiprocessing.Pool(n_processos)
+
+    def enviar(self, G: Dict[int, Set[int]], states: List[Optional[int]], peso: int, arquivo: str, tecnica: str,
+               is_lower_bound: bool, is_upper_bound: bool, pasta: str):
+        def erro(excecao: BaseException):
+            print(f"❌ Erro ao gerar a imagem de '{tecnica}' do grafo {arquivo}: {excecao!r}")
+
+        self.pool.apply_async(plotar_grafico, (G, states, peso, arquivo, tecnica, is_lower_bound, is_upper_bound,
+                                               pasta), error_callback=erro)
+
+    def aguardar(self):
+        self.pool.close()
+        self.pool.join()
+
+    def cancelar(self):
+        """Encerra o pool sem esperar as imagens pendentes (execução interrompida)."""
+        self.pool.terminate()
+        self.pool.join()
+
+    def __enter__(self) -> 'FilaPlotagem':
+        return self
+
+    def __exit__(self, *excecao):
+        self.aguardar()
+
+
 # ======================================================================
 # FUNÇÕES DE UTILIDADE (I/O)
 # ======================================================================
@@ -212,96 +311,330 @@ def importar_base1(file_path: str) -> Tuple[Dict[int, Set[int]], int, List[int]]
     return G, V, ordered_vertices
 
 
-def importar_base0(file_path: str) -> Tuple[Dict[int, Set[int]], int, List[int]]:
+# Versão do formato do cache binário de importar_base0 (incrementar se o conteúdo mudar)
+VERSAO_CACHE_GRAFO = 1
+
+
+def caminho_cache_grafo(file_path: str) -> str:
+    """Arquivo de cache binário de um grafo de importar_base0: '<arquivo>.cache.npz', ao lado do original."""
+    return file_path + '.cache.npz'
+
+
+def _cabecalho_base0(f) -> Tuple[int, int]:
+    """
+    Procura o cabeçalho (V V E) na primeira linha não comentada.
+
+    Returns:
+        Tuple[int, int]: V do cabeçalho (0 se não há cabeçalho) e a linha onde começam as arestas.
+    """
+    for i, line in enumerate(f):
+        line = line.strip()
+        if not line or line.startswith(('%', '#')):
+            continue
+
+        parts = line.split()
+        try:
+            if len(parts) >= 3 and parts[2].isdigit():
+                return int(parts[0]), i + 1
+        except ValueError:
+            pass
+        # Sem cabeçalho: esta já é a primeira linha de dados
+        return 0, 0
+
+    return 0, 0
+
+
+def _arestas_de_linhas(linhas) -> np.ndarray:
+    """Leitura das arestas em Python puro, ignorando as linhas malformadas."""
+    arestas = []
+    for line in linhas:
+        parts = line.split()
+        if len(parts) < 2: continue
+        try:
+            arestas.append((int(parts[0]), int(parts[1])))
+        except ValueError:
+            continue
+
+    return np.array(arestas, dtype=np.int64).reshape(-1, 2)
+
+
+def _arestas_linha_a_linha(file_path: str, inicio: int) -> np.ndarray:
+    """_arestas_de_linhas sobre as linhas do arquivo a partir de 'inicio'."""
+    with open(file_path, 'r') as f:
+        return _arestas_de_linhas(itertools.islice(f, inicio, None))
+
+
+def ler_arestas_base0(file_path: str) -> Tuple[int, np.ndarray]:
+    """
+    Lê o cabeçalho e as arestas de um arquivo no formato de importar_base0.
+
+    As arestas são lidas de uma vez por np.loadtxt (parser em C). Se alguma linha não tiver
+    dois inteiros (inclusive comentários '%', já que um segundo caractere de comentário faria o
+    np.loadtxt pré-processar cada linha em Python), o arquivo é relido linha a linha, ignorando as
+    linhas malformadas como antes.
+
+    Returns:
+        Tuple[int, np.ndarray]: V do cabeçalho (0 se ausente) e as arestas (E x 2), na ordem do arquivo.
+    """
+    with open(file_path, 'r') as f:
+        V, inicio = _cabecalho_base0(f)
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)  # Arquivo sem arestas
+            arestas = np.loadtxt(file_path, dtype=np.int64, comments='#', skiprows=inicio,
+                                 usecols=(0, 1), ndmin=2)
+    except ValueError:
+        arestas = _arestas_linha_a_linha(file_path, inicio)
+
+    return V, arestas.reshape(-1, 2)
+
+
+def _ler_cache_grafo(file_path: str, origem: os.stat_result) -> Optional[Tuple[int, np.ndarray, List[int]]]:
+    """Conteúdo do cache de file_path, ou None se não existe ou não corresponde ao arquivo atual."""
+    try:
+        with np.load(caminho_cache_grafo(file_path), allow_pickle=False) as dados:
+            if (int(dados['versao']) != VERSAO_CACHE_GRAFO or int(dados['mtime_ns']) != origem.st_mtime_ns
+                    or int(dados['tamanho']) != origem.st_size):
+                return None
+            return int(dados['V']), dados['arestas'], dados['ordem'].tolist()
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Cache corrompido ou ilegível: o arquivo de texto é lido novamente
+        return None
+
+
+def _gravar_cache_grafo(file_path: str, origem: os.stat_result, V: int, arestas: np.ndarray,
+                        ordered_vertices: List[int]):
+    """Grava o cache de file_path (por arquivo temporário + os.replace, seguro entre processos)."""
+    temporario = f"{caminho_cache_grafo(file_path)}.{os.getpid()}.tmp"
+    try:
+        with open(temporario, 'wb') as f:
+            np.savez(f, versao=VERSAO_CACHE_GRAFO, mtime_ns=origem.st_mtime_ns, tamanho=origem.st_size, V=V,
+                     arestas=arestas, ordem=np.array(ordered_vertices, dtype=np.int64))
+        os.replace(temporario, caminho_cache_grafo(file_path))
+    except OSError:
+        # Pasta somente leitura, por exemplo: segue sem cache
+        try:
+            os.remove(temporario)
+        except OSError:
+            pass
+
+
+def grafo_de_arestas(arestas: np.ndarray, V: int) -> Dict[int, Set[int]]:
+    """
+    Lista de adjacência equivalente a adicionar as arestas uma a uma, na ordem do array
+    (G[u].add(v); G[v].add(u)): mesma ordem das chaves de G e de iteração de cada G[u].
+
+    Os eventos de inserção são agrupados por vértice com um argsort estável, e cada G[u] é
+    criado por set() sobre os vizinhos na ordem de inserção, sem laço em Python por aresta.
+    Vértices de 0 a V-1 sem arestas entram no final, como isolados.
+    """
+    origem = arestas.reshape(-1)  # u0, v0, u1, v1, ...: ordem em que cada vértice recebe um vizinho
+    destino = arestas[:, ::-1].reshape(-1)
+    ordem = np.argsort(origem, kind='stable')
+    origem_ordenada = origem[ordem]
+    vizinhos = destino[ordem].tolist()
+
+    # Início do grupo de cada vértice; pela ordenação estável, ordem[inicio] é a sua primeira aparição
+    inicios = np.flatnonzero(np.diff(origem_ordenada, prepend=origem_ordenada[:1] - 1))
+    fins = np.append(inicios[1:], len(origem_ordenada))
+    adjacencia = {u: set(vizinhos[inicio:fim])
+                  for u, inicio, fim in zip(origem_ordenada[inicios].tolist(), inicios.tolist(), fins.tolist())}
+
+    # Chaves na ordem da primeira aparição de cada vértice
+    G: Dict[int, Set[int]] = {u: adjacencia[u] for u in origem[np.sort(ordem[inicios])].tolist()}
+    for i in range(V):
+        if i not in G: G[i] = set()
+
+    return G
+
+
+def importar_base0(file_path: str, csr: bool = False, cache: bool = True) -> \
+        Tuple[Union[Dict[int, Set[int]], 'GrafoCSR'], int, List[int]]:
     """
     Importa um grafo a partir de um arquivo de lista de arestas (0-based)
     com cabeçalho simples (V V E), como o formato 'grafo-vv-n-0.p.txt'.
 
     O Grafo e os vértices são mantidos em 0-based para todo o código.
 
+    As arestas são lidas por ler_arestas_base0. Com cache=True, as arestas e a ordem por grau são
+    gravadas em caminho_cache_grafo(file_path) e reaproveitadas enquanto o mtime e o tamanho do
+    arquivo original não mudarem. As arestas são inseridas em G na ordem do arquivo, portanto G
+    (inclusive a ordem de iteração de G[u]) é o mesmo com ou sem cache (ver grafo_de_arestas).
+
+    Args:
+        csr (bool): Se True, o grafo é devolvido como GrafoCSR (arrays NumPy indptr/indices)
+                    em vez de Dict[int, Set[int]].
+        cache (bool): Usa e mantém o cache binário ao lado do arquivo.
+
     Returns:
         Tuple[Dict[int, Set[int]], int, List[int]]: Grafo (G, 0-based),
                                                    Número total de vértices (V),
                                                    e Vértices ordenados por grau (decrescente, 0-based).
     """
-    G: Dict[int, Set[int]] = {}
-    V = 0
-    max_id_lido = -1  # O maior ID lido no arquivo (0-based)
+    try:
+        origem = os.stat(file_path)
+        lido = _ler_cache_grafo(file_path, origem) if cache else None
+        if lido is not None:
+            V, arestas, ordered_vertices = lido
+        else:
+            V, arestas = ler_arestas_base0(file_path)
+            # Usa o maior valor lido para V, caso o cabeçalho esteja errado ou ausente.
+            if len(arestas):
+                V = max(V, int(arestas.max()) + 1)
+    except FileNotFoundError:
+        print(f"Erro: Arquivo não encontrado no caminho: {file_path}")
+        return ({} if not csr else grafo_para_csr({})), 0, []
+
+    # Grafo não-direcionado, com as arestas na ordem do arquivo; vértices isolados incluídos
+    G = grafo_de_arestas(arestas, V)
+
+    if lido is None:
+        # Ordenação dos Vértices (Heurística de Busca por Grau Decrescente)
+        vertex_degrees = [(len(G.get(u_id, set())), u_id) for u_id in range(V)]  # Loop de 0 a V-1
+        vertex_degrees.sort(key=lambda x: x[0], reverse=True)
+        ordered_vertices = [u_id for degree, u_id in vertex_degrees]
+        if cache:
+            _gravar_cache_grafo(file_path, origem, V, arestas, ordered_vertices)
+
+    if csr:
+        return grafo_para_csr(G), V, ordered_vertices
+
+    return G, V, ordered_vertices
 
+
+# ======================================================================
+# LEITURA EM FLUXO (ARQUIVOS GRANDES, MTX E LISTA DE ARESTAS)
+# ======================================================================
+
+# Linhas de arestas lidas por bloco em blocos_de_arestas (a memória de trabalho é proporcional a isto)
+TAMANHO_BLOCO_ARESTAS = 100_000
+
+# Caractere de comentário passado ao np.loadtxt em cada formato. Com um único caractere o parser
+# fica todo em C; linhas com o outro ('%' em 'base0', '#' em 'mtx') caem na leitura linha a linha.
+COMENTARIO_FORMATO = {'base0': '#', 'mtx': '%'}
+
+
+def detectar_formato(file_path: str) -> str:
+    """
+    Formato do arquivo de grafo: 'mtx' (Matrix Market, 1-based) pela extensão .mtx ou pela
+    linha '%%MatrixMarket' no início; caso contrário 'base0' (lista de arestas de importar_base0).
+    """
+    if os.path.splitext(file_path)[1].lower() == '.mtx':
+        return 'mtx'
     try:
         with open(file_path, 'r') as f:
-            lines = f.readlines()
+            if f.readline().startswith('%%MatrixMarket'):
+                return 'mtx'
+    except (OSError, UnicodeDecodeError):
+        pass
+    return 'base0'
 
-            # 1. Processamento do Cabeçalho (Pula comentários e linhas vazias, e lê V E)
-            data_start_line = 0
 
-            for i, line in enumerate(lines):
-                line = line.strip()
-                if not line or line.startswith(('%', '#')):
-                    continue
+def _cabecalho_mtx(f) -> Tuple[int, int]:
+    """
+    Lê o cabeçalho MTX (linhas colunas entradas) após os comentários '%'.
 
-                parts = line.split()
-                try:
-                    # O cabeçalho deve ser a primeira linha não comentada com V V E.
-                    if len(parts) >= 3 and parts[2].isdigit():
-                        # Vértices são V e arestas são E
-                        V_lido = int(parts[0])
-                        # Atualiza V, o loop de dados deve começar na linha seguinte
-                        V = V_lido
-                        data_start_line = i + 1
-                    break
-                except ValueError:
-                    # Se falhar, assume que esta é a primeira linha de dados.
-                    break
+    Returns:
+        Tuple[int, int]: max(linhas, colunas) e a linha onde começam as entradas.
+    """
+    for i, line in enumerate(f):
+        parts = line.split()
+        if not parts or parts[0].startswith('%'):
+            continue
+        try:
+            return max(int(parts[0]), int(parts[1])), i + 1
+        except (ValueError, IndexError):
+            return 0, i  # Cabeçalho inválido: a linha é tratada como entrada (e descartada, se malformada)
 
-            # 2. Leitura e Processamento das Arestas (A partir de data_start_line)
-            for line in lines[data_start_line:]:
-                parts = line.split()
-                if len(parts) < 2: continue
-                try:
-                    u_0based, v_0based = int(parts[0]), int(parts[1])
+    return 0, 0
+
+
+def cabecalho_grafo(file_path: str, formato: Optional[str] = None) -> Tuple[int, int]:
+    """
+    V declarado no cabeçalho (0 se ausente) e a linha onde começam as arestas, no formato dado
+    (ou detectado por detectar_formato).
+    """
+    formato = formato or detectar_formato(file_path)
+    with open(file_path, 'r') as f:
+        return _cabecalho_mtx(f) if formato == 'mtx' else _cabecalho_base0(f)
 
-                    # 💥 SEM CONVERSÃO PARA 1-BASED
-                    u = u_0based
-                    v = v_0based
 
-                    # Rastreia o ID máximo (agora 0-based)
-                    max_id_lido = max(max_id_lido, u, v)
+def _arestas_do_bloco(linhas: List[str], comentario: str) -> np.ndarray:
+    """Arestas (k x 2) de um bloco de linhas, por np.loadtxt, ou linha a linha se houver linha malformada."""
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)  # Bloco só com comentários
+            arestas = np.loadtxt(linhas, dtype=np.int64, comments=comentario, usecols=(0, 1), ndmin=2)
+    except ValueError:
+        arestas = _arestas_de_linhas(linhas)
 
-                    # Adiciona arestas
-                    if u not in G: G[u] = set()
-                    if v not in G: G[v] = set()
+    return arestas.reshape(-1, 2)
 
-                    # Grafo não-direcionado
-                    G[u].add(v)
-                    G[v].add(u)
-                except ValueError:
-                    continue
 
-            # 3. Ajuste Final e Inicialização de Vértices
-            # Usa o maior valor lido para V, caso o cabeçalho esteja errado ou ausente.
-            V = max(V, max_id_lido + 1)  # O número de vértices é o max_id + 1 (pois é 0-based)
+def blocos_de_arestas(file_path: str, formato: Optional[str] = None,
+                      tamanho_bloco: int = TAMANHO_BLOCO_ARESTAS) -> Iterator[np.ndarray]:
+    """
+    Lê as arestas do arquivo em blocos de até tamanho_bloco linhas, sem carregar o arquivo inteiro.
+
+    Cada bloco é um array (k x 2) 0-based na ordem do arquivo (índices MTX são convertidos de 1-based).
+    Linhas malformadas são ignoradas, como em importar_base0, e entradas com índice negativo
+    após a conversão são descartadas. Colunas além da segunda (pesos do MTX) são ignoradas.
+    """
+    formato = formato or detectar_formato(file_path)
+    _, inicio = cabecalho_grafo(file_path, formato)
+    deslocamento = 1 if formato == 'mtx' else 0
+
+    with open(file_path, 'r') as f:
+        linhas = itertools.islice(f, inicio, None)
+        while True:
+            bloco = list(itertools.islice(linhas, tamanho_bloco))
+            if not bloco:
+                return
+
+            arestas = _arestas_do_bloco(bloco, COMENTARIO_FORMATO[formato]) - deslocamento
+            yield arestas[(arestas >= 0).all(axis=1)]
+
 
-            # Garante que todos os vértices (0 a V-1) existam no dicionário G, mesmo se forem isolados.
-            for i in range(V):  # Loop de 0 a V-1
-                if i not in G: G[i] = set()
+def importar_grafo(file_path: str, tamanho_bloco: int = TAMANHO_BLOCO_ARESTAS) -> \
+        Tuple[Dict[int, Set[int]], int, List[int]]:
+    """
+    Importa um grafo como lista de adjacência, escolhendo o leitor pelo formato (detectar_formato):
+    'base0' usa importar_base0 (com cache binário); 'mtx' lê as entradas por blocos_de_arestas
+    e monta G com grafo_de_arestas (os laços e as entradas repetidas são tratados como em importar_base0).
+
+    Returns:
+        Tuple[Dict[int, Set[int]], int, List[int]]: Grafo (G, 0-based), Número total de vértices (V),
+                                                   e Vértices ordenados por grau (decrescente, 0-based).
+    """
+    try:
+        formato = detectar_formato(file_path)
+        if formato == 'base0':
+            return importar_base0(file_path)
 
+        V, _ = cabecalho_grafo(file_path, formato)
+        arestas = np.concatenate([np.zeros((0, 2), dtype=np.int64)]
+                                 + list(blocos_de_arestas(file_path, formato, tamanho_bloco)))
     except FileNotFoundError:
         print(f"Erro: Arquivo não encontrado no caminho: {file_path}")
         return {}, 0, []
 
-    # 4. Ordenação dos Vértices (Heurística de Busca por Grau Decrescente)
-    vertex_degrees = [(len(G.get(u_id, set())), u_id) for u_id in range(V)]  # Loop de 0 a V-1
-    vertex_degrees.sort(key=lambda x: x[0], reverse=True)
-    ordered_vertices = [u_id for degree, u_id in vertex_degrees]
+    if len(arestas):
+        V = max(V, int(arestas.max()) + 1)
+    G = grafo_de_arestas(arestas, V)
 
-    return G, V, ordered_vertices
+    vertex_degrees = [(len(G[u_id]), u_id) for u_id in range(V)]
+    vertex_degrees.sort(key=lambda x: x[0], reverse=True)
+    return G, V, [u_id for degree, u_id in vertex_degrees]
 
 
 def recuperar_lista_arquivos(nome_pasta: str):
     """
     Abre a pasta especificada e gera uma lista com os nomes de todos
-    os arquivos e diretórios contidos nela.
+    os arquivos e diretórios contidos nela. Os caches gravados ao lado dos
+    grafos (caminho_cache_grafo) não entram na lista.
 
     Args:
         nome_pasta (str): O nome da pasta a ser aberta.
@@ -320,7 +653,8 @@ def recuperar_lista_arquivos(nome_pasta: str):
         apenas_arquivos = []
         for item in lista_de_itens:
             caminho_completo = os.path.join(nome_pasta, item)
-            if os.path.isfile(caminho_completo):
+            # caminho_cache_grafo('') é o sufixo dos caches de importar_base0
+            if os.path.isfile(caminho_completo) and not item.endswith(caminho_cache_grafo('')):
                 apenas_arquivos.append(item)
 
         return apenas_arquivos
@@ -333,18 +667,19 @@ def recuperar_lista_arquivos(nome_pasta: str):
         return []
 
 
-def exportar_excel(nome_arquivo, sheet_name: str):
+def exportar_excel(nome_arquivo, sheet_name: str, resultados: Optional[List[Tuple]] = None):
     """
-        Exporta o conteúdo da lista global RESULTADOS_GRAFOS_BRANCH_AND_BOUND
-        para um arquivo Excel.
+        Exporta o conteúdo da lista de resultados para um arquivo Excel.
 
         Args:
             nome_arquivo (str): Nome do arquivo Excel a ser criado.
             sheet_name (str): Nome da planilha dentro do arquivo Excel.
+            resultados (Optional[List[Tuple]]): Registros a exportar (padrão: lista global RESULTADOS).
         """
-    global RESULTADOS
+    if resultados is None:
+        resultados = RESULTADOS
 
-    if not RESULTADOS:
+    if not resultados:
         print("⚠️ A lista de resultados está vazia. Nenhuma exportação para Excel realizada.")
         return
 
@@ -359,11 +694,14 @@ def exportar_excel(nome_arquivo, sheet_name: str):
     # O os.path.join garante que as barras (/ ou \) fiquem corretas p/ o seu sistema
     caminho_completo = os.path.join(nome_pasta, nome_arquivo)
 
+    import pandas as pd
+
     try:
         # 1. Cria o DataFrame do Pandas a partir da lista de tuplas global
-        df = pd.DataFrame(RESULTADOS,
+        df = pd.DataFrame(resultados,
                           columns=['Algoritmo', 'Ordem', 'Com lower bound?', 'Com upper bound?', 'Grafo', 'Peso', 'Segundos',
-                                   'Vértices com peso'])
+                                   'Vértices com peso', 'Lower bound provado', 'Gap', 'Ótimo provado?'] +
+                                  [coluna for _, coluna in COLUNAS_ESTATISTICAS])
 
         # 2. Exporta o DataFrame para o Excel
         # index=False: Evita que o índice numérico padrão do Pandas seja escrito no Excel.
@@ -384,16 +722,44 @@ def exportar_excel(nome_arquivo, sheet_name: str):
         print(f"❌ Ocorreu um erro durante a exportação: {e}")
 
 
+# Estatísticas do Solver registradas por adicionar_resultado: (chave em Solver.estatisticas, coluna da planilha)
+COLUNAS_ESTATISTICAS: List[Tuple[str, str]] = [
+    ('nos_expandidos', 'Nós expandidos'),
+    ('podas_inviabilidade', 'Podas por inviabilidade'),
+    ('podas_peso', 'Podas por peso'),
+    ('podas_lower_bound', 'Podas por lower bound'),
+    ('podas_lp', 'Podas pela relaxação LP'),
+    ('folhas_rejeitadas', 'Folhas rejeitadas'),
+    ('profundidade_maxima', 'Profundidade máxima'),
+    ('vertices_fixados', 'Vértices fixados (presolve)'),
+    ('melhorias_incumbente', 'Melhorias do incumbente'),
+    ('tempo_lower_bound', 'Tempo em lower bound (s)'),
+    ('tempo_viabilidade', 'Tempo em viabilidade (s)'),
+    ('tempo_lp', 'Tempo na relaxação LP (s)'),
+]
+
+
 def adicionar_resultado(tecnica: str, is_lower_bound: bool, is_upper_bound: bool, nome_grafo: str, peso_encontrado: int,
-                        tempo: float, vertices_selecionados: []):
+                        tempo: float, vertices_selecionados: [], resultados: Optional[List[Tuple]] = None,
+                        ordem_ramificacao: Optional[List[int]] = None, limite_inferior: Optional[float] = None,
+                        gap: Optional[float] = None, otimo_provado: bool = False,
+                        estatisticas: Optional[Dict[str, float]] = None):
     """
-    Adiciona o nome do grafo e o peso calculado à lista global.
+    Adiciona o nome do grafo e o peso calculado à lista de resultados (padrão: lista global RESULTADOS).
+    limite_inferior, gap, otimo_provado e estatisticas vêm do Solver (None / False para a atribuição
+    gulosa); as estatísticas são gravadas na ordem de COLUNAS_ESTATISTICAS.
     """
-    global RESULTADOS
+    if estatisticas is None:
+        estatisticas = {}
+    if resultados is None:
+        resultados = RESULTADOS
+    if ordem_ramificacao is None:
+        ordem_ramificacao = BRANCHING_ORDER
 
     # Adiciona o novo resultado como uma tupla (nome, peso)
-    RESULTADOS.append(
-        (tecnica, BRANCHING_ORDER, is_lower_bound, is_upper_bound, nome_grafo, peso_encontrado, tempo, vertices_selecionados))
+    resultados.append(
+        (tecnica, ordem_ramificacao, is_lower_bound, is_upper_bound, nome_grafo, peso_encontrado, tempo, vertices_selecionados,
+         limite_inferior, gap, otimo_provado) + tuple(estatisticas.get(chave) for chave, _ in COLUNAS_ESTATISTICAS))
     # print(f"Resultado adicionado: Grafo '{nome_grafo}', Peso: {peso_encontrado}")
 
 
@@ -538,6 +904,215 @@ def atribuicao_valida(G: Dict[int, Set[int]], estados: List[Optional[int]]) -> b
     return False
 
 
+# ======================================================================
+# REDUÇÕES (PRESOLVE)
+# ======================================================================
+
+class Reducoes(NamedTuple):
+    """
+    Resultado de reducoes_drt.
+
+    fixados: vértice -> valor fixado.
+    dominios: vértice -> valores permitidos (apenas vértices não fixados com domínio menor que {0, 1, 2}).
+    registro: (regra, vértices, valores) de cada redução, na ordem em que foi aplicada.
+    """
+    fixados: Dict[int, int]
+    dominios: Dict[int, Tuple[int, ...]]
+    registro: List[Tuple[str, Tuple[int, ...], Tuple[int, ...]]]
+
+
+def reducoes_drt(G: Dict[int, Set[int]]) -> Reducoes:
+    """
+    Reduções da Dominação Romana Total aplicadas antes da busca.
+    Cada regra preserva ao menos uma solução ótima (o peso ótimo não muda):
+
+    1. K2 (dois vértices de grau 1 ligados entre si): os dois recebem 1.
+    2. Folha (grau 1): domínio {0, 1}. Uma folha com 2 pode passar a 1, pois seu único vizinho
+       já tem peso >= 1, e nenhum outro vértice depende dela.
+    3. Suporte (vizinho de folha): domínio {1, 2}. Se a folha recebe 0, o suporte precisa de 2;
+       caso contrário o suporte precisa de peso >= 1 para a folha não ficar isolada.
+    4. Suporte de duas ou mais folhas: fixado em 2, e as folhas além da primeira fixadas em 0.
+       Com o suporte em 1 todas as folhas precisariam de 1; suporte 2 com uma folha 1 não pesa mais.
+    5. Gêmeos falsos (mesma vizinhança aberta, grau >= 2): trocar os valores de dois gêmeos preserva
+       a solução e, se dois gêmeos têm 2, um deles pode passar a 1. Logo os gêmeos após o primeiro
+       de cada classe ficam com domínio {0, 1}.
+
+    As reduções apenas fixam ou restringem valores; nenhum vértice é removido do grafo, portanto
+    a solução da busca já é a solução do grafo original.
+    """
+    fixados: Dict[int, int] = {}
+    dominios: Dict[int, Tuple[int, ...]] = {}
+    registro: List[Tuple[str, Tuple[int, ...], Tuple[int, ...]]] = []
+
+    folhas_por_suporte: Dict[int, List[int]] = {}
+    for v_id in sorted(G):
+        if len(G[v_id]) == 1:
+            (suporte,) = G[v_id]
+            folhas_por_suporte.setdefault(suporte, []).append(v_id)
+
+    for suporte, folhas in folhas_por_suporte.items():
+        # Regra 1: K2
+        if len(G[suporte]) == 1:
+            if suporte < folhas[0]:
+                fixados[suporte] = fixados[folhas[0]] = 1
+                registro.append(('K2', (suporte, folhas[0]), (1,)))
+            continue
+
+        if len(folhas) >= 2:
+            # Regra 4: suporte fixado em 2, folhas extras em 0
+            fixados[suporte] = 2
+            registro.append(('suporte de várias folhas', (suporte,), (2,)))
+            for folha in folhas[1:]:
+                fixados[folha] = 0
+            registro.append(('folhas extras', tuple(folhas[1:]), (0,)))
+        else:
+            # Regra 3: suporte
+            dominios[suporte] = (1, 2)
+            registro.append(('suporte', (suporte,), (1, 2)))
+
+        # Regra 2: folha (a primeira de cada suporte)
+        dominios[folhas[0]] = (0, 1)
+        registro.append(('folha', (folhas[0],), (0, 1)))
+
+    # Regra 5: gêmeos falsos
+    classes: Dict[frozenset, List[int]] = {}
+    for v_id in sorted(G):
+        if len(G[v_id]) >= 2:
+            classes.setdefault(frozenset(G[v_id]), []).append(v_id)
+
+    for gemeos in classes.values():
+        if len(gemeos) >= 2:
+            for v_id in gemeos[1:]:
+                dominios[v_id] = (0, 1)
+            registro.append(('gêmeos falsos', tuple(gemeos), (0, 1)))
+
+    return Reducoes(fixados, dominios, registro)
+
+
+def aplicar_reducoes(ordered_vertices: List[int], reducoes: Reducoes, ordem_ramificacao: List[int]) -> \
+        Tuple[List[int], List[List[int]]]:
+    """
+    Prepara a ordem de visitação e os domínios da busca a partir das reduções.
+
+    Os vértices fixados vão para o início da ordem: com um único valor, eles não ramificam e a
+    árvore passa a ter apenas os vértices livres como níveis de decisão.
+
+    Returns:
+        Tuple[List[int], List[List[int]]]: Nova ordem de visitação e, para cada vértice, os valores
+                                           permitidos na ordem de ordem_ramificacao.
+    """
+    dominios = [ordem_ramificacao] * len(ordered_vertices)
+    for v_id, valores in reducoes.dominios.items():
+        dominios[v_id] = [valor for valor in ordem_ramificacao if valor in valores]
+    for v_id, valor in reducoes.fixados.items():
+        dominios[v_id] = [valor]
+
+    fixados = [v_id for v_id in ordered_vertices if v_id in reducoes.fixados]
+    livres = [v_id for v_id in ordered_vertices if v_id not in reducoes.fixados]
+
+    return fixados + livres, dominios
+
+
+# ======================================================================
+# VIABILIDADE INCREMENTAL
+# ======================================================================
+
+class ContadoresVizinhanca:
+    """
+    Contadores por vértice que permitem verificar a inviabilidade de forma incremental.
+
+    Para cada vértice u são mantidos:
+    - viz_2[u]: número de vizinhos com peso 2;
+    - viz_12[u]: número de vizinhos com peso 1 ou 2;
+    - viz_u[u]: número de vizinhos ainda não atribuídos (V_U).
+
+    Como apenas um vértice muda entre um nó da árvore e seu pai, basta atualizar os contadores
+    do vértice alterado e de sua vizinhança: O(grau) por nó, em vez de O(V+E) de atribuicao_valida.
+    """
+
+    __slots__ = ('G', 'viz_2', 'viz_12', 'viz_u')
+
+    def __init__(self, G: Dict[int, Set[int]], estados: List[Optional[int]]):
+        self.G = G
+        V = len(estados)
+        self.viz_2 = [0] * V
+        self.viz_12 = [0] * V
+        self.viz_u = [0] * V
+
+        for u_id in range(V):
+            for v_id in G[u_id]:
+                val = estados[v_id]
+                if val is None:
+                    self.viz_u[u_id] += 1
+                elif val >= 1:
+                    self.viz_12[u_id] += 1
+                    if val == 2:
+                        self.viz_2[u_id] += 1
+
+    def atribuir(self, u_id: int, valor: int):
+        """Atualiza os contadores dos vizinhos de u_id quando u_id passa de V_U para o peso 'valor'."""
+        viz_2, viz_12, viz_u = self.viz_2, self.viz_12, self.viz_u
+        for v_id in self.G[u_id]:
+            viz_u[v_id] -= 1
+            if valor >= 1:
+                viz_12[v_id] += 1
+                if valor == 2:
+                    viz_2[v_id] += 1
+
+    def desfazer(self, u_id: int, valor: int):
+        """Reverte atribuir(u_id, valor), devolvendo u_id para V_U."""
+        viz_2, viz_12, viz_u = self.viz_2, self.viz_12, self.viz_u
+        for v_id in self.G[u_id]:
+            viz_u[v_id] += 1
+            if valor >= 1:
+                viz_12[v_id] -= 1
+                if valor == 2:
+                    viz_2[v_id] -= 1
+
+    def vertice_inviavel(self, estados: List[Optional[int]], u_id: int) -> bool:
+        """
+        Aplica a u_id as mesmas regras de atribuicao_valida, em O(1).
+
+        - u com peso 0: sem vizinho de peso 2 e sem vizinho em V_U (C1 irreparável).
+        - u com peso 1 ou 2: sem vizinho de peso >= 1 e sem vizinho em V_U (C2 irreparável).
+        - u em V_U: todos os vizinhos em V_A e nenhum deles com peso >= 1.
+        """
+        if self.viz_u[u_id]:
+            return False
+
+        if estados[u_id] == 0:
+            return not self.viz_2[u_id]
+
+        return not self.viz_12[u_id]
+
+
+def atribuicao_valida_incremental(contadores: ContadoresVizinhanca, estados: List[Optional[int]],
+                                  u_id: Optional[int] = None) -> bool:
+    """
+    Versão incremental de atribuicao_valida baseada em ContadoresVizinhanca.
+
+    Se u_id for informado, assume que o estado anterior à atribuição de u_id já foi verificado
+    e examina apenas u_id e seus vizinhos (os únicos vértices cujas regras podem ter mudado).
+    A inviabilidade é monotônica: um vértice condenado tem todos os vizinhos em V_A, logo seus
+    contadores não mudam mais e ele continua condenado em todos os descendentes.
+    Sem u_id, todos os vértices são verificados (usado na raiz da busca).
+
+    Returns:
+        bool: True se o estado parcial é inviável.
+    """
+    if u_id is None:
+        return any(contadores.vertice_inviavel(estados, v_id) for v_id in range(len(estados)))
+
+    if contadores.vertice_inviavel(estados, u_id):
+        return True
+
+    for v_id in contadores.G[u_id]:
+        if contadores.vertice_inviavel(estados, v_id):
+            return True
+
+    return False
+
+
 def validar_solucao_final(G: Dict[int, Set[int]], solucao: List[int]) -> bool:
     """
     Verifica se uma solução completa respeita estritamente as regras da DRT.
@@ -726,6 +1301,102 @@ def lower_bound_future(G: Dict[int, Set[int]], estados: List[Optional[int]], V_U
     return L_total
 
 
+def formulacao_drt(G: Dict[int, Set[int]]) -> Tuple[np.ndarray, 'sparse.csr_matrix', np.ndarray]:
+    """
+    Formulação inteira da Dominação Romana Total, com variáveis binárias x_v (f(v) = 1) e
+    y_v (f(v) = 2), na ordem [x_0..x_{V-1}, y_0..y_{V-1}]. Minimiza soma(x_v + 2 y_v) sujeito a:
+        x_v + y_v + soma_{u em N(v)} y_u >= 1          (f(v) = 0 exige vizinho com 2)
+        x_v + y_v <= soma_{u em N(v)} (x_u + y_u)      (f(v) >= 1 exige vizinho com peso >= 1)
+        x_v + y_v <= 1
+
+    Returns:
+        Tuple[np.ndarray, sparse.csr_matrix, np.ndarray]: Custos c e restrições na forma A_ub @ [x, y] <= b_ub.
+    """
+    from scipy import sparse
+
+    V = len(G)
+    linhas, colunas, valores = [], [], []
+
+    def termo(linha: int, coluna: int, valor: float):
+        linhas.append(linha)
+        colunas.append(coluna)
+        valores.append(valor)
+
+    for v_id in range(V):
+        termo(v_id, v_id, -1.0)
+        termo(v_id, V + v_id, -1.0)
+        termo(V + v_id, v_id, 1.0)
+        termo(V + v_id, V + v_id, 1.0)
+        termo(2 * V + v_id, v_id, 1.0)
+        termo(2 * V + v_id, V + v_id, 1.0)
+        for u_id in G[v_id]:
+            termo(v_id, V + u_id, -1.0)
+            termo(V + v_id, u_id, -1.0)
+            termo(V + v_id, V + u_id, -1.0)
+
+    c = np.concatenate([np.ones(V), 2 * np.ones(V)])
+    A_ub = sparse.csr_matrix((valores, (linhas, colunas)), shape=(3 * V, 2 * V))
+    b_ub = np.concatenate([-np.ones(V), np.zeros(V), np.ones(V)])
+    return c, A_ub, b_ub
+
+
+def estados_de_variaveis(z: np.ndarray, V: int) -> List[int]:
+    """Converte [x, y] (formulacao_drt) em estados 0/1/2."""
+    return [2 if z[V + v_id] > 0.5 else 1 if z[v_id] > 0.5 else 0 for v_id in range(V)]
+
+
+class RelaxacaoLP:
+    """
+    Lower bound pela relaxação linear (variáveis em [0, 1]) de formulacao_drt.
+
+    A matriz de restrições é montada uma única vez por grafo; em cada nó só mudam os limites
+    das variáveis, fixadas conforme 'estados'. O HiGHS, pela interface de linprog, não aceita a
+    base do nó pai como ponto de partida, então cada chamada resolve o LP do início.
+
+    Atributos:
+        chamadas (int): LPs resolvidos.
+        tempo (float): Tempo total gasto em linprog, em segundos.
+    """
+
+    # Limites (x, y) de um vértice atribuído com cada valor
+    LIMITES_VALOR = {0: ((0, 0), (0, 0)), 1: ((1, 1), (0, 0)), 2: ((0, 0), (1, 1))}
+
+    def __init__(self, G: Dict[int, Set[int]]):
+        from scipy.optimize import linprog
+
+        self._linprog = linprog
+        self.V = len(G)
+        self.c, self.A_ub, self.b_ub = formulacao_drt(G)
+        self.chamadas = 0
+        self.tempo = 0.0
+
+    def limite(self, estados: List[Optional[int]]) -> float:
+        """
+        Lower bound do peso total de qualquer solução que complete 'estados'
+        (inclui o peso já atribuído).
+
+        Returns:
+            float: Teto do valor ótimo do LP (inf se o LP é inviável, 0 se o HiGHS falhou).
+        """
+        inicio = time.perf_counter()
+        V = self.V
+        limites = [(0, 1)] * (2 * V)
+        for v_id, valor in enumerate(estados):
+            if valor is not None:
+                limites[v_id], limites[V + v_id] = self.LIMITES_VALOR[valor]
+
+        resultado = self._linprog(self.c, A_ub=self.A_ub, b_ub=self.b_ub, bounds=limites, method='highs')
+        self.chamadas += 1
+        self.tempo += time.perf_counter() - inicio
+
+        if resultado.status == 2:
+            return float('inf')
+        if resultado.status != 0:
+            return 0
+        # Tolerância numérica antes do arredondamento para cima (os pesos são inteiros)
+        return math.ceil(resultado.fun - 1e-6)
+
+
 # ======================================================================
 # Upper Bound
 # ======================================================================
@@ -870,182 +1541,2832 @@ def n_rodadas_gulosas(G: Dict[int, Set[int]], ordered_vertices: List[int], attem
     return best_states, int(best_u)
 
 
-# ======================================================================
-# FUNÇÕES DE RAMIFICAÇÃO (Branch and Bound)
-# ======================================================================
-
-def bb_recursive(G: Dict[int, Set[int]],
-                 V: int,
-                 ordered_vertices: List[int],
-                 estados: List[Optional[int]],
-                 current_weight: int,
-                 list_index: int,
-                 is_lower_bound: bool):
+def busca_local(G: Dict[int, Set[int]], estados: List[int], tempo_limite: Optional[float] = 1.0) -> \
+        Tuple[List[int], int]:
     """
-    Função recursiva principal (DFS) do Branch and Bound.
-    O Grafo (G) e os Estados (estados) são 0-based.
+    Melhora uma DRT completa (ex.: a de atribuicao_direta_gulosa) por busca local de primeira melhora.
 
-    Esta função explora o espaço de busca, podando ramos inviáveis ou não-promissoros.
+    Movimentos:
+    - Retirar peso redundante de um vértice: 2 -> 0, 2 -> 1 e 1 -> 0 (maior ganho primeiro).
+    - Passar o 2 de u para um vizinho v (u: 2 -> 0, v: f(v) -> 2). Com f(v) = 1 a troca ganha 1;
+      com f(v) = 0 o peso não muda, e a troca só é mantida se liberar uma redução em N[u] ou N[v].
 
-    Args:
-        G, V: Grafo e número de vértices.
-        ordered_vertices: Ordem de visitação dos vértices.
-        estados: O estado de atribuição de pesos (solução parcial).
-        current_weight: Peso acumulado da solução parcial (W_current).
-        list_index: Índice do vértice atual a ser ramificado (u).
+    Os contadores viz_2 / viz_12 (vizinhos com peso 2 / >= 1) são atualizados em O(grau) a cada
+    mudança, e só o vértice alterado e seus vizinhos precisam ser verificados: cada movimento é
+    avaliado em O(grau). A busca termina em um ótimo local ou após tempo_limite segundos
+    (None = sem limite). O grafo (G) e os estados são 0-based.
+
+    Returns:
+        Tuple[List[int], int]: O estado melhorado e o seu peso.
     """
-    global BEST_WEIGHT
-    global BEST_STATES
+    estados = list(estados)
+    V = len(estados)
+    viz_2 = [0] * V
+    viz_12 = [0] * V
+    for u_id in range(V):
+        for w_id in G[u_id]:
+            if estados[w_id] >= 1:
+                viz_12[u_id] += 1
+                if estados[w_id] == 2:
+                    viz_2[u_id] += 1
+
+    def mudar(u_id: int, novo: int):
+        antigo = estados[u_id]
+        delta_12 = (novo >= 1) - (antigo >= 1)
+        delta_2 = (novo == 2) - (antigo == 2)
+        estados[u_id] = novo
+        if delta_12 or delta_2:
+            for w_id in G[u_id]:
+                viz_12[w_id] += delta_12
+                viz_2[w_id] += delta_2
+
+    def satisfeito(v_id: int) -> bool:
+        return viz_2[v_id] > 0 if estados[v_id] == 0 else viz_12[v_id] > 0
+
+    def viavel_em_torno(u_id: int) -> bool:
+        return satisfeito(u_id) and all(satisfeito(w_id) for w_id in G[u_id])
+
+    def reduzir(u_id: int) -> int:
+        """Tenta diminuir o valor de u_id (0 antes de 1); devolve o ganho (0 se nada mudou)."""
+        antigo = estados[u_id]
+        for novo in range(antigo):
+            mudar(u_id, novo)
+            if viavel_em_torno(u_id):
+                return antigo - novo
+            mudar(u_id, antigo)
+        return 0
 
-    # Log do peso
-    #print(f"Melhor: {BEST_WEIGHT}, Atual: {current_weight} ")
+    def trocar(u_id: int, v_id: int) -> int:
+        """Passa o 2 de u_id para o vizinho v_id; devolve o ganho (0 se a troca foi desfeita)."""
+        antigo_v = estados[v_id]
+        mudar(u_id, 0)
+        mudar(v_id, 2)
+        if viavel_em_torno(u_id) and viavel_em_torno(v_id):
+            ganho = antigo_v
+            if not ganho:
+                for w_id in [u_id, v_id, *G[u_id], *G[v_id]]:
+                    if estados[w_id] and w_id != v_id:
+                        ganho = reduzir(w_id)
+                        if ganho:
+                            break
+            if ganho:
+                return ganho
+
+        mudar(v_id, antigo_v)
+        mudar(u_id, 2)
+        return 0
 
-    # 1. CRITÉRIO DE PARADA: Solução Completa
-    # Se todos os vértices foram atribuídos (o índice passou do último vértice),
-    # o estado 'estados' é uma solução final.
-    if list_index >= V:
-        if current_weight < BEST_WEIGHT:
-            # Checagem Final: Garante que a solução completa é realmente viável.
-            is_valid_final = not atribuicao_valida(G, estados)
+    prazo = time.perf_counter() + tempo_limite if tempo_limite is not None else None
+    # Vértices de grau menor primeiro: são os que menos contribuem para a dominação
+    ordem = sorted(range(V), key=lambda v_id: len(G[v_id]))
 
-            if is_valid_final:
-                BEST_WEIGHT = current_weight
-                BEST_STATES = list(estados)
+    melhorou = True
+    while melhorou:
+        melhorou = False
+        for u_id in ordem:
+            if prazo is not None and time.perf_counter() >= prazo:
+                return estados, sum(estados)
+            if estados[u_id] and reduzir(u_id):
+                melhorou = True
 
-                # Log de mudança de valor
-                # print(f"Peso atualizado: {BEST_WEIGHT}")
+        if melhorou:
+            continue
 
-        return
+        for u_id in ordem:
+            if prazo is not None and time.perf_counter() >= prazo:
+                return estados, sum(estados)
+            if estados[u_id] == 2 and any(estados[v_id] < 2 and trocar(u_id, v_id) for v_id in G[u_id]):
+                melhorou = True
 
-    # Passo 1: Poda Rápida (Verificação de Inviabilidade Imediata)
-    # Se o estado parcial for irreparavelmente inviável (ex: nó atribuído=0 sem vizinho=2 em V_A),
-    # o custo é infinito e o ramo é podado.
-    if atribuicao_valida(G, estados):
-        return
+    return estados, sum(estados)
 
-    # 2. RAMIFICAÇÃO (Para o vértice atual 'u')
-    u_id = ordered_vertices[list_index]  # ID do vértice (0-based)
-    u_index = u_id  # O índice é o próprio ID (0-based)
 
-    # A ordem de ramificação (2, 1, 0) é uma heurística para encontrar bons bounds
-    # mais rapidamente, priorizando pesos mais altos.
+def _lista_restrita(candidatos: List[int], pontuacao, alfa: float) -> List[int]:
+    """Lista restrita de candidatos (RCL): pontuação >= máx - alfa * (máx - mín)."""
+    valores = [pontuacao(v_id) for v_id in candidatos]
+    corte = max(valores) - alfa * (max(valores) - min(valores))
+    return [v_id for v_id, valor in zip(candidatos, valores) if valor >= corte]
 
-    for value in BRANCHING_ORDER:
-        new_estados = list(estados)
-        new_estados[u_index] = value
-        new_weight = current_weight + value
+
+def construcao_aleatoria(G: Dict[int, Set[int]], rng: random.Random, alfa: float = 0.2,
+                         criterio: str = 'demanda') -> List[int]:
+    """
+    Construção gulosa aleatorizada (fase construtiva do GRASP).
+
+    1. Enquanto houver vértice descoberto (peso 0 sem vizinho com 2), sorteia na RCL um vértice
+       que cubra algum deles e atribui 2. A pontuação é o número de vértices descobertos em N[v]
+       (criterio='demanda') ou o grau de v (criterio='grau').
+    2. Cada vértice com peso >= 1 sem vizinho de peso >= 1 recebe um vizinho com 1, sorteado
+       na RCL por grau.
+
+    Com alfa = 0 a escolha é puramente gulosa; com alfa = 1 é uniforme entre os candidatos.
+
+    Returns:
+        List[int]: Estados 0/1/2 (uma DRT, se G não tem vértices isolados).
+    """
+    V = len(G)
+    estados = [0] * V
+    descobertos = set(range(V))
+    # Vértices descobertos em N[v]
+    demanda = [len(G[v_id]) + 1 for v_id in range(V)]
+    if criterio == 'demanda':
+        pontuacao = demanda.__getitem__
+    elif criterio == 'grau':
+        pontuacao = lambda v_id: len(G[v_id])
+    else:
+        raise ValueError(f"Critério desconhecido: {criterio}")
+
+    while descobertos:
+        candidatos = [v_id for v_id in range(V) if estados[v_id] < 2 and demanda[v_id] > 0]
+        v_id = rng.choice(_lista_restrita(candidatos, pontuacao, alfa))
+        estados[v_id] = 2
+        for w_id in [v_id, *G[v_id]]:
+            if w_id in descobertos:
+                descobertos.discard(w_id)
+                demanda[w_id] -= 1
+                for x_id in G[w_id]:
+                    demanda[x_id] -= 1
+
+    positivos = [v_id for v_id in range(V) if estados[v_id]]
+    rng.shuffle(positivos)
+    for v_id in positivos:
+        if not any(estados[w_id] for w_id in G[v_id]) and G[v_id]:
+            w_id = rng.choice(_lista_restrita(sorted(G[v_id]), lambda x_id: len(G[x_id]), alfa))
+            estados[w_id] = 1
+
+    return estados
+
+
+class ResultadoGRASP(NamedTuple):
+    """
+    Resultado de grasp.
+
+    Atributos:
+        estados (Optional[List[int]]): Melhor solução encontrada (None se nenhuma é válida).
+        peso (float): Peso da melhor solução (inf se nenhuma é válida).
+        pesos (List[float]): Peso obtido por cada início, na ordem das sementes (inf = inválida).
+    """
+    estados: Optional[List[int]]
+    peso: float
+    pesos: List[float]
+
+
+# Contexto de cada processo de grasp, preenchido por _inicializar_grasp
+_GRASP: Dict = {}
+
+
+def _inicializar_grasp(G: Dict[int, Set[int]], alfa: float, criterio: str, tempo_busca_local: Optional[float]):
+    _GRASP.update(G=G, alfa=alfa, criterio=criterio, tempo_busca_local=tempo_busca_local)
+
+
+def _inicio_grasp(semente: int) -> Tuple[List[int], float]:
+    """Um início do GRASP: construção aleatorizada com a semente dada, seguida de busca_local."""
+    G = _GRASP['G']
+    estados = construcao_aleatoria(G, random.Random(semente), _GRASP['alfa'], _GRASP['criterio'])
+    estados, peso = busca_local(G, estados, _GRASP['tempo_busca_local'])
+    return estados, peso if validar_solucao_final(G, estados) else float('inf')
+
+
+def grasp(G: Dict[int, Set[int]], n_inicios: int = 32, alfa: float = 0.2, criterio: str = 'demanda',
+          semente: int = 0, n_processos: Optional[int] = None,
+          tempo_busca_local: Optional[float] = None) -> ResultadoGRASP:
+    """
+    GRASP: n_inicios construções aleatorizadas (construcao_aleatoria), cada uma melhorada por
+    busca_local, distribuídas entre n_processos processos (padrão: os.cpu_count()).
+
+    O início i usa a semente 'semente + i', portanto o resultado não depende do número de processos.
+    Dentro de um processo daemon (ex.: trabalhador de um Pool) os inícios rodam em série.
+
+    Returns:
+        ResultadoGRASP: A melhor solução e o peso de cada início.
+    """
+    sementes = range(semente, semente + n_inicios)
+    n_processos = min(n_processos or os.cpu_count() or 1, n_inicios)
+    argumentos = (G, alfa, criterio, tempo_busca_local)
+
+    if n_processos > 1 and not multiprocessing.current_process().daemon:
+        with multiprocessing.Pool(n_processos, initializer=_inicializar_grasp, initargs=argumentos) as pool:
+            solucoes = pool.map(_inicio_grasp, sementes, chunksize=max(1, n_inicios // (4 * n_processos)))
+    else:
+        _inicializar_grasp(*argumentos)
+        solucoes = [_inicio_grasp(s) for s in sementes]
+
+    pesos = [peso for _, peso in solucoes]
+    melhor = min(range(len(solucoes)), key=pesos.__getitem__, default=None)
+    if melhor is None or pesos[melhor] == float('inf'):
+        return ResultadoGRASP(None, float('inf'), pesos)
+    return ResultadoGRASP(solucoes[melhor][0], pesos[melhor], pesos)
+
+
+# ======================================================================
+# ESTADO DA BUSCA (MUTAÇÃO IN-PLACE COM TRILHA)
+# ======================================================================
+
+# Maior escala inteira de _DemandaIncremental; acima dela os termos de demanda são float
+ESCALA_MAXIMA_DEMANDA = 2 ** 63
+
+# Tolerância do arredondamento para cima da demanda em float
+TOLERANCIA_DEMANDA = 1e-9
+
+
+class _DemandaIncremental:
+    """
+    Mantém a demanda total de lower_bound como estado da busca, atualizada a cada atribuição.
+
+    Atribuir um vértice u só altera os termos de demanda (2/|N_U(v)|, 1/|N_U(v)|, 1/(|N_U(v)|+1))
+    de u e de seus vizinhos, logo a atualização custa O(grau) em vez de O(V·grau).
+    Os termos são guardados como inteiros na escala mmc(1..grau_max+1), de modo que somar e
+    subtrair termos não acumula erro de arredondamento ao longo da busca.
+
+    O mmc cresce exponencialmente com o grau máximo: se passa de ESCALA_MAXIMA_DEMANDA (grau
+    máximo acima de 41), os termos passam a ser float (escala = 0). Nesse caso, quando a soma
+    fica a menos de 1e-6 de um inteiro, ela é refeita com math.fsum (o erro acumulado nunca
+    chega perto disso), e o arredondamento para cima desconta TOLERANCIA_DEMANDA.
+
+    As subclasses implementam _termo_demanda(v_id) e chamam _atualizar_demanda(u_id)
+    depois de cada atribuição e de cada desfazer.
+    """
+
+    __slots__ = ()
+
+    def _iniciar_demanda(self):
+        grau_max = max((len(vizinhos) for vizinhos in self.G.values()), default=0)
+        escala = math.lcm(*range(1, grau_max + 2))
+        if escala <= ESCALA_MAXIMA_DEMANDA:
+            self.escala = escala
+            self.inversos = [0] + [escala // k for k in range(1, grau_max + 2)]
+        else:
+            self.escala = 0
+            self.inversos = [0] + [1.0 / k for k in range(1, grau_max + 2)]
+        self.demanda = [self._termo_demanda(v_id) for v_id in range(len(self.estados))]
+        self.demanda_total = sum(self.demanda)
+
+    def _atualizar_demanda(self, u_id: int):
+        demanda = self.demanda
+        termo = self._termo_demanda(u_id)
+        total = self.demanda_total + termo - demanda[u_id]
+        demanda[u_id] = termo
+
+        for v_id in self.G[u_id]:
+            termo = self._termo_demanda(v_id)
+            total += termo - demanda[v_id]
+            demanda[v_id] = termo
+
+        self.demanda_total = total
+
+    def lower_bound(self) -> int:
+        """Demanda mínima futura de V_U (lower_bound com current_weight = 0)."""
+        if self.demanda is None:
+            return lower_bound(self.G, self.estados, 0)
+
+        # Teto de demanda_total / escala em aritmética inteira
+        if self.escala:
+            return -(-self.demanda_total // self.escala)
+
+        total = self.demanda_total
+        if abs(total - round(total)) < 1e-6:
+            # Perto de um inteiro o erro acumulado pode mudar o teto: a soma é refeita
+            total = self.demanda_total = math.fsum(self.demanda)
+        return math.ceil(total - TOLERANCIA_DEMANDA)
+
+
+class EstadoBusca(_DemandaIncremental):
+    """
+    Estado único e mutável compartilhado por toda a busca do B&B.
+
+    Em vez de copiar 'estados' a cada ramo, a atribuição é feita no próprio vetor e o vértice
+    é empilhado na trilha; ao retroceder, desfazer() remove o último vértice da trilha e
+    reverte o vetor de estados, os contadores de vizinhança e o peso acumulado.
+    Assim a DFS não aloca listas por nó.
+
+    Atributos:
+        estados (List[Optional[int]]): Atribuição parcial (None = V_U).
+        contadores (ContadoresVizinhanca): Contadores coerentes com 'estados'.
+        peso (int): Soma dos pesos atribuídos (W_current).
+        trilha (List[int]): Vértices atribuídos, na ordem em que foram atribuídos.
+        demanda (Optional[List[int]]): Termos de demanda do lower bound por vértice
+                                       (None se o lower bound incremental não foi pedido).
+    """
+
+    __slots__ = ('G', 'estados', 'contadores', 'peso', 'trilha', 'escala', 'inversos', 'demanda', 'demanda_total')
+
+    def __init__(self, G: Dict[int, Set[int]], estados: List[Optional[int]], lower_bound_incremental: bool = False):
+        self.G = G
+        self.estados = estados
+        self.contadores = ContadoresVizinhanca(G, estados)
+        self.peso = sum(val for val in estados if val is not None)
+        self.trilha: List[int] = []
+        self.demanda = None
+
+        if lower_bound_incremental:
+            self._iniciar_demanda()
+
+    def atribuir(self, u_id: int, valor: int):
+        """Atribui 'valor' ao vértice u_id (que deve estar em V_U) e registra na trilha."""
+        self.estados[u_id] = valor
+        self.contadores.atribuir(u_id, valor)
+        self.peso += valor
+        self.trilha.append(u_id)
+        if self.demanda is not None:
+            self._atualizar_demanda(u_id)
+
+    def desfazer(self):
+        """Desfaz a última atribuição registrada na trilha."""
+        u_id = self.trilha.pop()
+        valor = self.estados[u_id]
+        self.contadores.desfazer(u_id, valor)
+        self.peso -= valor
+        self.estados[u_id] = None
+        if self.demanda is not None:
+            self._atualizar_demanda(u_id)
+
+    def inviavel(self, u_id: Optional[int] = None) -> bool:
+        """Verificação de inviabilidade (ver atribuicao_valida_incremental)."""
+        return atribuicao_valida_incremental(self.contadores, self.estados, u_id)
+
+    def _termo_demanda(self, v_id: int) -> int:
+        """Termo de demanda de v_id em lower_bound, multiplicado por 'escala' (float se escala = 0)."""
+        contadores = self.contadores
+        v_val = self.estados[v_id]
+        count_N_v_U = contadores.viz_u[v_id]
+
+        # Regra 3: V_U sem vizinho V_A >= 1
+        if v_val is None:
+            return 0 if contadores.viz_12[v_id] else self.inversos[count_N_v_U + 1]
+
+        if not count_N_v_U:
+            return 0
+
+        # Regra 1: V_A com peso 0 sem vizinho V_A=2
+        if v_val == 0:
+            return 0 if contadores.viz_2[v_id] else 2 * self.inversos[count_N_v_U]
+
+        # Regra 2: V_A com peso >= 1 sem vizinho V_A >= 1
+        return 0 if contadores.viz_12[v_id] else self.inversos[count_N_v_U]
+
+
+# ======================================================================
+# REPRESENTAÇÃO EM BITS (MÁSCARAS INTEIRAS)
+# ======================================================================
+
+def grafo_para_bits(G: Dict[int, Set[int]]) -> List[int]:
+    """
+    Converte a lista de adjacência em máscaras de bits: o bit v de adj[u] é 1 se (u, v) é aresta.
+
+    Returns:
+        List[int]: adj[u] para u de 0 a V-1.
+    """
+    adj = [0] * len(G)
+    for u_id, vizinhos in G.items():
+        mascara = 0
+        for v_id in vizinhos:
+            mascara |= 1 << v_id
+        adj[u_id] = mascara
+    return adj
+
+
+class EstadoBuscaBits(_DemandaIncremental):
+    """
+    Alternativa a EstadoBusca em que vizinhanças e classes de valor são máscaras de bits.
+
+    Cada teste do tipo "algum vizinho de u tem peso 2 / >= 1 / está em V_U" vira um único AND
+    entre adj[u] e a máscara da classe. Mantém a mesma interface de EstadoBusca
+    (atribuir, desfazer, inviavel, lower_bound), portanto os motores de busca funcionam com
+    qualquer uma das duas representações e produzem resultados idênticos.
+
+    Atributos:
+        adj (List[int]): Máscaras de vizinhança (grafo_para_bits).
+        classes (List[int]): classes[k] é a máscara dos vértices atribuídos com peso k (0, 1, 2).
+        mascara_u (int): Máscara dos vértices em V_U.
+    """
+
+    __slots__ = ('G', 'adj', 'estados', 'classes', 'mascara_u', 'peso', 'trilha',
+                 'escala', 'inversos', 'demanda', 'demanda_total')
+
+    def __init__(self, G: Dict[int, Set[int]], estados: List[Optional[int]], adj: Optional[List[int]] = None,
+                 lower_bound_incremental: bool = False):
+        self.G = G
+        self.adj = adj if adj is not None else grafo_para_bits(G)
+        self.estados = estados
+        self.classes = [0, 0, 0]
+        self.mascara_u = 0
+        self.peso = 0
+        self.trilha: List[int] = []
+        self.demanda = None
+
+        for u_id, val in enumerate(estados):
+            if val is None:
+                self.mascara_u |= 1 << u_id
+            else:
+                self.classes[val] |= 1 << u_id
+                self.peso += val
+
+        if lower_bound_incremental:
+            self._iniciar_demanda()
+
+    def atribuir(self, u_id: int, valor: int):
+        """Atribui 'valor' ao vértice u_id (que deve estar em V_U) e registra na trilha."""
+        bit = 1 << u_id
+        self.estados[u_id] = valor
+        self.mascara_u ^= bit
+        self.classes[valor] |= bit
+        self.peso += valor
+        self.trilha.append(u_id)
+        if self.demanda is not None:
+            self._atualizar_demanda(u_id)
+
+    def desfazer(self):
+        """Desfaz a última atribuição registrada na trilha."""
+        u_id = self.trilha.pop()
+        bit = 1 << u_id
+        valor = self.estados[u_id]
+        self.classes[valor] ^= bit
+        self.mascara_u |= bit
+        self.peso -= valor
+        self.estados[u_id] = None
+        if self.demanda is not None:
+            self._atualizar_demanda(u_id)
+
+    def vertice_inviavel(self, u_id: int) -> bool:
+        """Mesmas regras de ContadoresVizinhanca.vertice_inviavel, com um AND por classe."""
+        vizinhos = self.adj[u_id]
+        if vizinhos & self.mascara_u:
+            return False
+
+        if self.estados[u_id] == 0:
+            return not (vizinhos & self.classes[2])
+
+        return not (vizinhos & (self.classes[1] | self.classes[2]))
+
+    def inviavel(self, u_id: Optional[int] = None) -> bool:
+        """Verificação de inviabilidade (ver atribuicao_valida_incremental)."""
+        if u_id is None:
+            return any(self.vertice_inviavel(v_id) for v_id in range(len(self.estados)))
+
+        if self.vertice_inviavel(u_id):
+            return True
+
+        for v_id in self.G[u_id]:
+            if self.vertice_inviavel(v_id):
+                return True
+
+        return False
+
+    def _termo_demanda(self, v_id: int) -> int:
+        """Termo de demanda de v_id em lower_bound, multiplicado por 'escala' (float se escala = 0)."""
+        vizinhos = self.adj[v_id]
+        v_val = self.estados[v_id]
+        count_N_v_U = (vizinhos & self.mascara_u).bit_count()
+
+        if v_val is None:
+            return 0 if vizinhos & (self.classes[1] | self.classes[2]) else self.inversos[count_N_v_U + 1]
+
+        if not count_N_v_U:
+            return 0
+
+        if v_val == 0:
+            return 0 if vizinhos & self.classes[2] else 2 * self.inversos[count_N_v_U]
+
+        return 0 if vizinhos & (self.classes[1] | self.classes[2]) else self.inversos[count_N_v_U]
+
+    def lower_bound(self) -> int:
+        """
+        Mesmo cálculo de lower_bound(G, estados, 0), com contagens por popcount de máscaras.
+        A soma é feita na mesma ordem de vértices, portanto o resultado é idêntico.
+        Com lower_bound_incremental, usa a demanda mantida por _DemandaIncremental.
+        """
+        if self.demanda is not None:
+            return _DemandaIncremental.lower_bound(self)
+
+        adj = self.adj
+        estados = self.estados
+        mascara_u = self.mascara_u
+        mascara_2 = self.classes[2]
+        mascara_12 = self.classes[1] | mascara_2
+        total_min_demand = 0.0
+
+        for v_id in range(len(estados)):
+            vizinhos = adj[v_id]
+            v_val = estados[v_id]
+            count_N_v_U = (vizinhos & mascara_u).bit_count()
+
+            # Regra 1: V_A com peso 0 sem vizinho V_A=2
+            if v_val == 0:
+                if count_N_v_U > 0 and not (vizinhos & mascara_2):
+                    total_min_demand += 2.0 / count_N_v_U
+
+            # Regra 3: V_U sem vizinho V_A >= 1
+            elif v_val is None:
+                if not (vizinhos & mascara_12):
+                    total_min_demand += 1.0 / (count_N_v_U + 1)
+
+            # Regra 2: V_A com peso >= 1 sem vizinho V_A >= 1
+            elif count_N_v_U > 0 and not (vizinhos & mascara_12):
+                total_min_demand += 1.0 / count_N_v_U
+
+        return int(math.ceil(total_min_demand))
+
+
+def atribuicao_direta_gulosa_bits(G: Dict[int, Set[int]], ordered_vertices: List[int],
+                                  adj: Optional[List[int]] = None) -> Tuple[List[int], int]:
+    """
+    Versão de atribuicao_direta_gulosa com testes de vizinhança por máscaras de bits.
+
+    Os vizinhos candidatos a receber peso são percorridos na mesma ordem de G[u],
+    portanto os desempates e o resultado são idênticos aos da versão com conjuntos.
+
+    Returns:
+        Tuple[List[int], int]: O estado (estados_guloso) e o peso total (current_weight).
+    """
+    if adj is None:
+        adj = grafo_para_bits(G)
+
+    V = len(G)
+    estados_guloso = [0] * V
+    current_weight = 0
+    mascara_12 = 0  # Vértices com peso 1 ou 2
+    mascara_2 = 0  # Vértices com peso 2
+
+    # Passo 1: Satisfação C2 (Dominação Simples)
+    for u_id in ordered_vertices:
+        if not (adj[u_id] & mascara_12) and estados_guloso[u_id] < 1:
+            estados_guloso[u_id] = 1
+            mascara_12 |= 1 << u_id
+            current_weight += 1
+
+    # Passo 2: Satisfação C1 (Ajuste para Dominação Romana)
+    for u_id in range(V):
+        if estados_guloso[u_id] == 0 and not (adj[u_id] & mascara_2):
+            best_neighbor_id = None
+            max_degree_change = -1
+
+            for v_id in G[u_id]:
+                if estados_guloso[v_id] < 2:
+                    current_degree = len(G[v_id])
+                    if current_degree > max_degree_change:
+                        max_degree_change = current_degree
+                        best_neighbor_id = v_id
+
+            if best_neighbor_id is not None:
+                current_weight += 2 - estados_guloso[best_neighbor_id]
+                estados_guloso[best_neighbor_id] = 2
+                mascara_12 |= 1 << best_neighbor_id
+                mascara_2 |= 1 << best_neighbor_id
+
+    # Passo 3: Vértices com peso >= 1 não podem ficar isolados de outros pesos positivos
+    for v_id in range(V):
+        if estados_guloso[v_id] >= 1 and not (adj[v_id] & mascara_12):
+            best_neighbor_id = None
+            max_degree = -1
+
+            for w_id in G[v_id]:
+                if estados_guloso[w_id] == 0:
+                    current_degree = len(G.get(w_id, set()))
+                    if current_degree > max_degree:
+                        max_degree = current_degree
+                        best_neighbor_id = w_id
+
+            if best_neighbor_id is not None:
+                estados_guloso[best_neighbor_id] = 1
+                mascara_12 |= 1 << best_neighbor_id
+                current_weight += 1
+
+    return estados_guloso, current_weight
+
+
+def criar_estado_busca(G: Dict[int, Set[int]], estados: List[Optional[int]], representacao: str = 'conjuntos',
+                       lower_bound_incremental: bool = False, adj: Optional[List[int]] = None):
+    """
+    Cria o estado mutável da busca na representação escolhida.
+
+    Args:
+        representacao: 'conjuntos' (EstadoBusca, vizinhanças como set) ou 'bits' (EstadoBuscaBits).
+        lower_bound_incremental: Mantém a demanda do lower bound durante a busca (O(grau) por nó).
+        adj: Máscaras de vizinhança já calculadas (grafo_para_bits), usadas só em 'bits'.
+    """
+    if representacao == 'conjuntos':
+        return EstadoBusca(G, estados, lower_bound_incremental=lower_bound_incremental)
+    if representacao == 'bits':
+        return EstadoBuscaBits(G, estados, adj=adj, lower_bound_incremental=lower_bound_incremental)
+    raise ValueError(f"Representação desconhecida: {representacao}")
+
+
+class BuscaCronometrada:
+    """
+    Envolve um estado de busca (EstadoBusca ou EstadoBuscaBits) e acumula em 'estatisticas'
+    o tempo gasto em inviavel (verificação de viabilidade) e em lower_bound.
+
+    Os demais atributos e métodos são repassados ao estado original. Só é usado com
+    Solver(cronometrar=True), para não pesar na busca normal.
+    """
+
+    def __init__(self, busca, estatisticas: Dict[str, float]):
+        self.busca = busca
+        self.estatisticas = estatisticas
+
+    def __getattr__(self, nome):
+        return getattr(self.busca, nome)
+
+    def atribuir(self, u_id: int, valor: int):
+        self.busca.atribuir(u_id, valor)
+
+    def desfazer(self):
+        self.busca.desfazer()
+
+    def inviavel(self, u_id: Optional[int] = None) -> bool:
+        inicio = time.perf_counter()
+        resultado = self.busca.inviavel(u_id)
+        self.estatisticas['tempo_viabilidade'] += time.perf_counter() - inicio
+        return resultado
+
+    def lower_bound(self) -> int:
+        inicio = time.perf_counter()
+        resultado = self.busca.lower_bound()
+        self.estatisticas['tempo_lower_bound'] += time.perf_counter() - inicio
+        return resultado
+
+
+# ======================================================================
+# REPRESENTAÇÃO CSR (NUMPY) E VERSÕES VETORIZADAS
+# ======================================================================
+
+class GrafoCSR(NamedTuple):
+    """
+    Grafo em formato CSR (Compressed Sparse Row).
+
+    Os vizinhos de u são indices[indptr[u]:indptr[u + 1]]. Cada aresta não-direcionada
+    aparece nas duas linhas.
+
+    Um GrafoCSR aberto por abrir_csr tem 'caminho' preenchido e arrays mapeados de disco: ao ser
+    enviado a outro processo (pickle), só o caminho é serializado e o processo de destino mapeia
+    os mesmos arquivos, compartilhando as páginas físicas pelo cache do sistema operacional.
+    """
+    indptr: np.ndarray
+    indices: np.ndarray
+    caminho: Optional[str] = None
+
+    @property
+    def V(self) -> int:
+        return len(self.indptr) - 1
+
+    def graus(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def vizinhos(self, u: int) -> np.ndarray:
+        return self.indices[self.indptr[u]:self.indptr[u + 1]]
+
+    def __reduce__(self):
+        if self.caminho is not None:
+            return abrir_csr, (self.caminho,)
+        return GrafoCSR, tuple(self)
+
+
+def grafo_para_csr(G: Dict[int, Set[int]]) -> GrafoCSR:
+    """
+    Converte a lista de adjacência (0-based) em GrafoCSR, mantendo a ordem de iteração de G[u].
+    """
+    V = len(G)
+    graus = np.fromiter((len(G[u_id]) for u_id in range(V)), dtype=np.int64, count=V)
+    indptr = np.zeros(V + 1, dtype=np.int64)
+    np.cumsum(graus, out=indptr[1:])
+    indices = np.fromiter((v_id for u_id in range(V) for v_id in G[u_id]), dtype=np.int64, count=int(indptr[-1]))
+    return GrafoCSR(indptr, indices)
+
+
+def csr_de_arestas(arestas: np.ndarray, V: int) -> GrafoCSR:
+    """
+    Monta o GrafoCSR diretamente da lista de arestas (E x 2), sem passar por Dict[int, Set[int]].
+
+    Arestas repetidas (em qualquer sentido) aparecem uma vez, e os vizinhos de cada vértice ficam
+    em ordem crescente. Como em grafo_de_arestas, um laço (u, u) torna u vizinho de si mesmo.
+    Os índices são int32 quando V cabe, para reduzir à metade o arquivo e as páginas lidas.
+    """
+    tipo = np.int32 if V < 2 ** 31 else np.int64
+    origem = np.concatenate((arestas[:, 0], arestas[:, 1])).astype(np.int64)
+    destino = np.concatenate((arestas[:, 1], arestas[:, 0])).astype(np.int64)
+    codigos = np.unique(origem * V + destino)  # Ordena por (u, v) e remove as repetições
+
+    indptr = np.zeros(V + 1, dtype=np.int64)
+    if V:
+        np.cumsum(np.bincount(codigos // V, minlength=V), out=indptr[1:])
+        codigos = codigos % V
+    return GrafoCSR(indptr, codigos.astype(tipo))
+
+
+def ordem_por_grau_csr(G: GrafoCSR) -> List[int]:
+    """Vértices por grau decrescente, com empates pelo índice (mesma ordem de importar_base0)."""
+    return np.argsort(-G.graus(), kind='stable').tolist()
+
+
+# Versão do formato da pasta CSR de gravar_csr (incrementar se o conteúdo mudar)
+VERSAO_CSR = 1
+
+def caminho_csr(file_path: str) -> str:
+    """Pasta CSR de um grafo de importar_csr: '<arquivo>.csr', ao lado do original."""
+    return file_path + '.csr'
+
+
+def _gravar_npy(pasta: str, nome: str, array: np.ndarray):
+    """Grava pasta/nome.npy por arquivo temporário + os.replace (quem já mapeou o antigo continua válido)."""
+    temporario = os.path.join(pasta, f"{nome}.{os.getpid()}.tmp")
+    with open(temporario, 'wb') as f:
+        np.save(f, array)
+    os.replace(temporario, os.path.join(pasta, nome + '.npy'))
+
+
+def gravar_csr(caminho: str, G: GrafoCSR, ordered_vertices: List[int],
+               origem: Optional[os.stat_result] = None):
+    """
+    Grava G na pasta 'caminho' como indptr.npy, indices.npy e ordem.npy, para abrir_csr.
+
+    meta.npy guarda (versão, mtime_ns, tamanho) do arquivo de origem e é gravado por último
+    (e removido antes de tudo): uma gravação interrompida nunca deixa a pasta aparentemente atual.
+
+    Args:
+        origem: os.stat do arquivo de texto de onde G foi lido (None se não há origem).
+    """
+    os.makedirs(caminho, exist_ok=True)
+    try:
+        os.remove(os.path.join(caminho, 'meta.npy'))
+    except FileNotFoundError:
+        pass
+
+    _gravar_npy(caminho, 'indptr', np.asarray(G.indptr, dtype=np.int64))
+    _gravar_npy(caminho, 'indices', np.asarray(G.indices))
+    _gravar_npy(caminho, 'ordem', np.array(ordered_vertices, dtype=np.int64))
+    meta = (VERSAO_CSR, origem.st_mtime_ns, origem.st_size) if origem is not None else (VERSAO_CSR, -1, -1)
+    _gravar_npy(caminho, 'meta', np.array(meta, dtype=np.int64))
+
+
+def abrir_csr(caminho: str) -> GrafoCSR:
+    """
+    Abre a pasta CSR de gravar_csr com np.memmap (somente leitura): nada é lido para a memória
+    até os vizinhos serem acessados, e vários processos que abrem o mesmo caminho compartilham
+    uma única cópia física do grafo.
+    """
+    # np.asarray tira a subclasse np.memmap (cujo __getitem__ em Python pesa no acesso vértice a vértice),
+    # mantendo a mesma visão sobre as páginas mapeadas
+    return GrafoCSR(np.asarray(np.load(os.path.join(caminho, 'indptr.npy'), mmap_mode='r')),
+                    np.asarray(np.load(os.path.join(caminho, 'indices.npy'), mmap_mode='r')),
+                    caminho)
+
+
+def _csr_atual(caminho: str, origem: os.stat_result) -> bool:
+    """True se a pasta CSR existe e foi gerada a partir do arquivo de origem em seu estado atual."""
+    try:
+        meta = np.load(os.path.join(caminho, 'meta.npy'), allow_pickle=False)
+    except FileNotFoundError:
+        return False
+    except Exception:
+        return False  # Pasta corrompida: é gerada novamente
+
+    return (len(meta) == 3 and int(meta[0]) == VERSAO_CSR and int(meta[1]) == origem.st_mtime_ns
+            and int(meta[2]) == origem.st_size)
+
+
+class DesempenhoLeitura(NamedTuple):
+    """Resumo de gravar_csr_em_fluxo."""
+    linhas: int  # Entradas lidas do arquivo (arestas válidas, com repetições e laços)
+    arestas: int  # Arestas distintas no CSR (cada aresta não-direcionada uma vez; laços incluídos)
+    V: int
+    segundos: float
+
+    @property
+    def arestas_por_segundo(self) -> float:
+        return self.linhas / self.segundos if self.segundos > 0 else float('inf')
+
+
+def _open_memmap_temporario(pasta: str, nome: str, dtype, tamanho: int) -> Tuple[np.ndarray, str]:
+    """Array .npy mapeado para escrita em um arquivo temporário da pasta (ver _gravar_npy)."""
+    temporario = os.path.join(pasta, f"{nome}.{os.getpid()}.tmp")
+    return np.lib.format.open_memmap(temporario, mode='w+', dtype=dtype, shape=(tamanho,)), temporario
+
+
+def gravar_csr_em_fluxo(file_path: str, caminho: str, formato: Optional[str] = None,
+                        tamanho_bloco: int = TAMANHO_BLOCO_ARESTAS) -> DesempenhoLeitura:
+    """
+    Grava a pasta CSR de gravar_csr lendo o arquivo em blocos (blocos_de_arestas), em duas passagens,
+    sem manter as arestas na memória: além de O(V) (graus e cursores), só um bloco de arestas
+    fica na memória por vez, e os vizinhos são escritos diretamente em arquivos mapeados.
+
+    1ª passagem: V e os graus (com repetições), que definem o espaço de cada linha.
+    2ª passagem: cada bloco é distribuído nas linhas de seus vértices.
+    Por fim, as linhas são ordenadas e as repetições removidas, em faixas de até tamanho_bloco
+    entradas, compactando o array no lugar. O conteúdo é o mesmo de csr_de_arestas.
+
+    Returns:
+        DesempenhoLeitura: Entradas lidas, arestas distintas, V e tempo total.
+    """
+    inicio = time.perf_counter()
+    formato = formato or detectar_formato(file_path)
+    origem = os.stat(file_path)
+    V, _ = cabecalho_grafo(file_path, formato)
+
+    # 1ª passagem: V e graus com repetições
+    graus = np.zeros(V, dtype=np.int64)
+    linhas = 0
+    for arestas in blocos_de_arestas(file_path, formato, tamanho_bloco):
+        linhas += len(arestas)
+        if not len(arestas):
+            continue
+        maior = int(arestas.max()) + 1
+        if maior > len(graus):
+            graus = np.concatenate((graus, np.zeros(maior - len(graus), dtype=np.int64)))
+        graus += np.bincount(arestas.reshape(-1), minlength=len(graus))
+    V = len(graus)
+    tipo = np.int32 if V < 2 ** 31 else np.int64
+
+    os.makedirs(caminho, exist_ok=True)
+    try:
+        os.remove(os.path.join(caminho, 'meta.npy'))
+    except FileNotFoundError:
+        pass
+
+    # 2ª passagem: cada entrada (u, v) vai para as linhas u e v, na posição do cursor da linha
+    indptr = np.zeros(V + 1, dtype=np.int64)
+    np.cumsum(graus, out=indptr[1:])
+    cursores = indptr[:-1].copy()
+    brutos, temporario_brutos = _open_memmap_temporario(caminho, 'indices_brutos', tipo, int(indptr[-1]))
+    for arestas in blocos_de_arestas(file_path, formato, tamanho_bloco):
+        origem_bloco = np.concatenate((arestas[:, 0], arestas[:, 1]))
+        ordem = np.argsort(origem_bloco, kind='stable')
+        origem_ordenada = origem_bloco[ordem]
+        # Posição de cada entrada dentro do grupo do seu vértice no bloco
+        inicios = np.flatnonzero(np.diff(origem_ordenada, prepend=-1))
+        posicao = np.arange(len(ordem)) - np.repeat(inicios, np.diff(np.append(inicios, len(ordem))))
+        brutos[cursores[origem_ordenada] + posicao] = np.concatenate((arestas[:, 1], arestas[:, 0]))[ordem]
+        cursores += np.bincount(origem_bloco, minlength=V)
+    del cursores
+
+    # Ordenação e remoção de repetições por faixas de linhas; a escrita nunca passa da leitura
+    novos_graus = np.zeros(V, dtype=np.int64)
+    escrita, lacos = 0, 0
+    u = 0
+    while u < V:
+        fim = max(int(np.searchsorted(indptr, indptr[u] + tamanho_bloco, side='right')) - 1, u + 1)
+        fim = min(fim, V)
+        linhas_faixa = np.repeat(np.arange(u, fim, dtype=np.int64), graus[u:fim])
+        codigos = np.unique(linhas_faixa * V + brutos[indptr[u]:indptr[fim]])
+        vizinhos, linhas_faixa = codigos % V, codigos // V
+        brutos[escrita:escrita + len(codigos)] = vizinhos
+        novos_graus[u:fim] = np.bincount(linhas_faixa - u, minlength=fim - u)
+        escrita += len(codigos)
+        lacos += int(np.count_nonzero(vizinhos == linhas_faixa))
+        u = fim
+
+    indptr[1:] = np.cumsum(novos_graus)
+    indices, temporario_indices = _open_memmap_temporario(caminho, 'indices', tipo, escrita)
+    for parte in range(0, escrita, tamanho_bloco):
+        fim_parte = min(parte + tamanho_bloco, escrita)
+        indices[parte:fim_parte] = brutos[parte:fim_parte]
+    indices.flush()
+    del indices, brutos
+    os.replace(temporario_indices, os.path.join(caminho, 'indices.npy'))
+    os.remove(temporario_brutos)
+
+    _gravar_npy(caminho, 'indptr', indptr)
+    _gravar_npy(caminho, 'ordem', np.argsort(-novos_graus, kind='stable'))
+    _gravar_npy(caminho, 'meta', np.array((VERSAO_CSR, origem.st_mtime_ns, origem.st_size), dtype=np.int64))
+
+    return DesempenhoLeitura(linhas, (escrita + lacos) // 2, V, time.perf_counter() - inicio)
+
+
+def importar_csr(file_path: str, caminho: Optional[str] = None,
+                 tamanho_bloco: int = TAMANHO_BLOCO_ARESTAS) -> Tuple[GrafoCSR, int, List[int]]:
+    """
+    Importa um grafo (lista de arestas 0-based ou MTX, ver detectar_formato) como GrafoCSR mapeado de disco.
+
+    Na primeira leitura (ou se o arquivo mudou de mtime ou tamanho), o CSR é gravado em 'caminho'
+    a partir do cache de importar_base0, se atual, ou por gravar_csr_em_fluxo, que lê o arquivo em
+    blocos com memória limitada e informa a vazão (arestas/s); nas seguintes, o grafo é apenas
+    mapeado, sem ler o texto nem montar Dict[int, Set[int]].
+    Os vizinhos ficam em ordem crescente (ver csr_de_arestas), e não na ordem de G[u] de importar_base0.
+
+    Args:
+        caminho: Pasta CSR (padrão: caminho_csr(file_path)).
+        tamanho_bloco: Linhas lidas por bloco na leitura em fluxo.
+
+    Returns:
+        Tuple[GrafoCSR, int, List[int]]: Grafo mapeado, V e vértices ordenados por grau (decrescente).
+    """
+    caminho = caminho or caminho_csr(file_path)
+    try:
+        origem = os.stat(file_path)
+    except FileNotFoundError:
+        print(f"Erro: Arquivo não encontrado no caminho: {file_path}")
+        return csr_de_arestas(np.zeros((0, 2), dtype=np.int64), 0), 0, []
+
+    if not _csr_atual(caminho, origem):
+        formato = detectar_formato(file_path)
+        lido = _ler_cache_grafo(file_path, origem) if formato == 'base0' else None
+        if lido is not None:
+            V, arestas, ordered_vertices = lido
+            gravar_csr(caminho, csr_de_arestas(arestas, V), ordered_vertices, origem)
+        else:
+            desempenho = gravar_csr_em_fluxo(file_path, caminho, formato, tamanho_bloco)
+            print(f"📥 {file_path}: {desempenho.linhas} arestas lidas em {desempenho.segundos:.2f} s "
+                  f"({desempenho.arestas_por_segundo:,.0f} arestas/s), {desempenho.arestas} distintas, "
+                  f"V = {desempenho.V}")
+
+    G = abrir_csr(caminho)
+    return G, G.V, np.load(os.path.join(caminho, 'ordem.npy')).tolist()
+
+
+def estados_para_array(estados: List[Optional[int]]) -> np.ndarray:
+    """Converte a lista de estados em um array int8, com -1 representando V_U (None)."""
+    return np.fromiter((-1 if val is None else val for val in estados), dtype=np.int8, count=len(estados))
+
+
+def _soma_por_vertice(G: GrafoCSR, valores_arestas: np.ndarray) -> np.ndarray:
+    """
+    Soma valores_arestas (um valor por entrada de G.indices) dentro do segmento de cada vértice,
+    com np.add.reduceat. Vértices sem vizinhos recebem 0 (reduceat não trata segmentos vazios).
+    A soma é acumulada em int64, então valores_arestas pode ser booleano (1 byte por aresta).
+    """
+    somas = np.zeros(G.V, dtype=np.int64)
+    com_vizinhos = G.indptr[:-1] < G.indptr[1:]
+    if valores_arestas.size:
+        somas[com_vizinhos] = np.add.reduceat(valores_arestas, G.indptr[:-1][com_vizinhos], dtype=np.int64)
+    return somas
+
+
+def _contagens_vizinhanca(G: GrafoCSR, estados: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Para todos os vértices de uma vez: vizinhos com peso 2, vizinhos com peso >= 1
+    e vizinhos em V_U (mesmos contadores de ContadoresVizinhanca).
+    """
+    estados_vizinhos = estados[G.indices]
+    viz_2 = _soma_por_vertice(G, estados_vizinhos == 2)
+    viz_12 = _soma_por_vertice(G, estados_vizinhos >= 1)
+    viz_u = _soma_por_vertice(G, estados_vizinhos < 0)
+    return viz_2, viz_12, viz_u
+
+
+def atribuicao_valida_csr(G: GrafoCSR, estados: Union[List[Optional[int]], np.ndarray]) -> bool:
+    """
+    Versão vetorizada de atribuicao_valida para GrafoCSR.
+
+    Args:
+        estados: Lista de estados (None = V_U) ou array de estados_para_array.
+
+    Returns:
+        bool: True se o estado parcial é inviável.
+    """
+    if not isinstance(estados, np.ndarray):
+        estados = estados_para_array(estados)
+
+    viz_2, viz_12, viz_u = _contagens_vizinhanca(G, estados)
+    sem_esperanca = viz_u == 0
+
+    inviavel_0 = (estados == 0) & (viz_2 == 0)
+    inviavel_12 = (estados != 0) & (viz_12 == 0)  # Peso 1 ou 2, ou V_U sem vizinho V_A >= 1
+
+    return bool(np.any(sem_esperanca & (inviavel_0 | inviavel_12)))
+
+
+def validar_solucao_final_csr(G: GrafoCSR, solucao: Union[List[int], np.ndarray]) -> bool:
+    """
+    Versão vetorizada de validar_solucao_final para GrafoCSR.
+
+    Returns:
+        bool: True se válida, False se inválida (com prints do erro).
+    """
+    solucao = np.asarray(solucao, dtype=np.int8)
+    viz_2, viz_12, _ = _contagens_vizinhanca(G, solucao)
+
+    erros_c1 = np.flatnonzero((solucao == 0) & (viz_2 == 0))
+    erros_c2 = np.flatnonzero((solucao > 0) & (viz_12 == 0))
+
+    for u_id in erros_c1:
+        print(f"❌ ERRO C1 no Vértice {u_id + 1}: Tem peso 0 mas NENHUM vizinho com peso 2.")
+    for u_id in erros_c2:
+        print(f"❌ ERRO C2 no Vértice {u_id + 1}: Tem peso {solucao[u_id]} mas está ISOLADO de outros pesos positivos (vizinhos são todos 0).")
+
+    valida = not (erros_c1.size or erros_c2.size)
+    if not valida:
+        print("⚠️ A solução apresentada é INVÁLIDA.")
+
+    return valida
+
+
+def lower_bound_csr(G: GrafoCSR, estados: Union[List[Optional[int]], np.ndarray], current_weight: int) -> int:
+    """
+    Versão vetorizada de lower_bound para GrafoCSR: os termos de demanda das três regras
+    são calculados para todos os vértices com reduções por segmento.
+    O resultado coincide com lower_bound, a menos da ordem de arredondamento da soma em ponto flutuante.
+    """
+    if not isinstance(estados, np.ndarray):
+        estados = estados_para_array(estados)
+
+    viz_2, viz_12, viz_u = _contagens_vizinhanca(G, estados)
+    demanda = np.zeros(G.V, dtype=np.float64)
+    tem_u = viz_u > 0
+
+    # Regra 1: V_A com peso 0 sem vizinho V_A=2 exige 2 de V_U
+    regra_1 = (estados == 0) & (viz_2 == 0) & tem_u
+    demanda[regra_1] = 2.0 / viz_u[regra_1]
+
+    # Regra 2: V_A com peso >= 1 sem vizinho V_A >= 1 exige 1 de V_U
+    regra_2 = (estados >= 1) & (viz_12 == 0) & tem_u
+    demanda[regra_2] = 1.0 / viz_u[regra_2]
+
+    # Regra 3: V_U sem vizinho V_A >= 1 exige 1 entre ele e seus vizinhos em V_U
+    regra_3 = (estados < 0) & (viz_12 == 0)
+    demanda[regra_3] = 1.0 / (viz_u[regra_3] + 1)
+
+    return current_weight + int(math.ceil(demanda.sum()))
+
+
+def atribuicao_direta_gulosa_csr(G: GrafoCSR, ordered_vertices: List[int]) -> Tuple[List[int], int]:
+    """
+    Versão de atribuicao_direta_gulosa para GrafoCSR, inclusive mapeado de disco (abrir_csr).
+
+    Os vizinhos de cada vértice são lidos como fatia de G.indices, e os testes de vizinhança usam
+    contadores de vizinhos com peso >= 1 e com peso 2 (arrays de V posições), atualizados quando um
+    vértice recebe peso: a memória extra é O(V), sem Dict[int, Set[int]].
+
+    Os candidatos são percorridos na ordem de G.indices, com o mesmo desempate (primeiro vizinho de
+    maior grau); para G = grafo_para_csr(G_conjuntos) o resultado é idêntico ao da versão com conjuntos.
+
+    Returns:
+        Tuple[List[int], int]: O estado (estados_guloso) e o peso total (current_weight).
+    """
+    V = G.V
+    graus = G.graus()
+    estados = np.zeros(V, dtype=np.int8)
+    viz_12 = np.zeros(V, dtype=np.int32)  # Vizinhos com peso 1 ou 2
+    viz_2 = np.zeros(V, dtype=np.int32)  # Vizinhos com peso 2
+    current_weight = 0
+
+    # Passo 1: Satisfação C2 (Dominação Simples)
+    for u_id in ordered_vertices:
+        if viz_12[u_id] == 0 and estados[u_id] < 1:
+            estados[u_id] = 1
+            viz_12[G.vizinhos(u_id)] += 1
+            current_weight += 1
+
+    # Passo 2: Satisfação C1 (Ajuste para Dominação Romana). Um vértice que não tem peso 0 ou
+    # já tem vizinho com 2 nunca volta a precisar de ajuste, então só os pendentes são percorridos.
+    for u_id in np.flatnonzero((estados == 0) & (viz_2 == 0)).tolist():
+        if estados[u_id] == 0 and viz_2[u_id] == 0:
+            vizinhos = G.vizinhos(u_id)
+            candidatos = vizinhos[estados[vizinhos] < 2]
+            if candidatos.size:
+                best_neighbor_id = int(candidatos[np.argmax(graus[candidatos])])
+                current_weight += 2 - int(estados[best_neighbor_id])
+                if estados[best_neighbor_id] == 0:
+                    viz_12[G.vizinhos(best_neighbor_id)] += 1
+                estados[best_neighbor_id] = 2
+                viz_2[G.vizinhos(best_neighbor_id)] += 1
+
+    # Passo 3: Vértices com peso >= 1 não podem ficar isolados de outros pesos positivos. Quem
+    # recebe 1 aqui é vizinho de um vértice com peso, então não entra na lista de pendentes.
+    for v_id in np.flatnonzero((estados >= 1) & (viz_12 == 0)).tolist():
+        if viz_12[v_id] == 0:
+            vizinhos = G.vizinhos(v_id)
+            candidatos = vizinhos[estados[vizinhos] == 0]
+            if candidatos.size:
+                best_neighbor_id = int(candidatos[np.argmax(graus[candidatos])])
+                estados[best_neighbor_id] = 1
+                viz_12[G.vizinhos(best_neighbor_id)] += 1
+                current_weight += 1
+
+    return estados.tolist(), current_weight
+
+
+# ======================================================================
+# FUNÇÕES DE RAMIFICAÇÃO (Branch and Bound)
+# ======================================================================
+
+# Desempates de OrdemDinamica: nome -> função (G, ordered_vertices) que devolve todos os vértices
+# em ordem de preferência (o primeiro é escolhido em caso de empate)
+DESEMPATES: Dict[str, Callable[[Dict[int, Set[int]], List[int]], List[int]]] = {
+    'ordem': lambda G, ordered_vertices: list(ordered_vertices),  # Ordem estática (grau decrescente)
+    'indice': lambda G, ordered_vertices: sorted(ordered_vertices),
+    'grau_crescente': lambda G, ordered_vertices: sorted(ordered_vertices, key=lambda v: len(G[v])),
+}
+
+
+class OrdemDinamica:
+    """
+    Escolha dinâmica do próximo vértice a ramificar, pelo vértice mais restrito.
+
+    Um vértice é crítico quando foi atribuído com 0 e ainda não tem vizinho com 2: algum dos
+    seus vizinhos em V_U terá de receber 2. O próximo vértice ramificado é um vizinho em V_U do
+    crítico com menos vizinhos em V_U (falha primeiro: com um único vizinho livre, o valor dele
+    fica forçado). Sem vértices críticos, vale o primeiro vértice de V_U no desempate. Vértices
+    com domínio unitário (fixados por reducoes_drt) vêm antes de todos.
+
+    Os críticos ficam em uma fila de baldes (bucket queue) indexada pelo número de vizinhos em V_U.
+    Cada balde é uma máscara de bits em que o bit de um vértice é a sua posição no desempate, e
+    'ocupados' marca os baldes não vazios; assim proximo() custa poucas operações com inteiros
+    (menor bit ligado) e atribuir/desfazer custam O(grau).
+
+    atribuir deve ser chamado depois de busca.atribuir, e desfazer depois de busca.desfazer
+    ('estados' é a mesma lista do estado da busca).
+
+    Atributos:
+        vertices (List[int]): Vértices em ordem de desempate (o bit i representa vertices[i]).
+        mascara_u (int): Vértices em V_U, em bits de desempate.
+        baldes (List[int]): baldes[k] é a máscara dos críticos com k vizinhos em V_U.
+        ocupados (int): Bit k ligado se baldes[k] não está vazio.
+    """
+
+    __slots__ = ('G', 'estados', 'vertices', 'bits', 'adj', 'mascara_u', 'mascara_fixos', 'viz_u', 'viz_2',
+                 'chave', 'baldes', 'ocupados')
+
+    def __init__(self, G: Dict[int, Set[int]], estados: List[Optional[int]], ordered_vertices: List[int],
+                 dominios: Optional[List[List[int]]] = None,
+                 desempate: Union[str, Callable[[Dict[int, Set[int]], List[int]], List[int]]] = 'ordem'):
+        """
+        Args:
+            estados: Lista de estados do estado da busca (pode ter vértices já atribuídos).
+            dominios: Valores de cada vértice (solver.dominios); os de domínio unitário vêm primeiro.
+            desempate: Nome em DESEMPATES ou função (G, ordered_vertices) -> vértices em ordem de preferência.
+        """
+        if isinstance(desempate, str):
+            if desempate not in DESEMPATES:
+                raise ValueError(f"Desempate desconhecido: {desempate}")
+            desempate = DESEMPATES[desempate]
+
+        self.G = G
+        self.estados = estados
+        self.vertices = list(desempate(G, ordered_vertices))
+        V = len(self.vertices)
+        self.bits = [0] * V
+        for posicao, v_id in enumerate(self.vertices):
+            self.bits[v_id] = 1 << posicao
+
+        self.adj = [0] * V
+        self.mascara_u = 0
+        self.mascara_fixos = 0
+        self.viz_u = [0] * V
+        self.viz_2 = [0] * V
+        for v_id in range(V):
+            for w_id in G[v_id]:
+                self.adj[v_id] |= self.bits[w_id]
+                if estados[w_id] is None:
+                    self.viz_u[v_id] += 1
+                elif estados[w_id] == 2:
+                    self.viz_2[v_id] += 1
+            if estados[v_id] is None:
+                self.mascara_u |= self.bits[v_id]
+            if dominios is not None and len(dominios[v_id]) == 1:
+                self.mascara_fixos |= self.bits[v_id]
+
+        grau_max = max((len(vizinhos) for vizinhos in G.values()), default=0)
+        self.chave = [-1] * V
+        self.baldes = [0] * (grau_max + 1)
+        self.ocupados = 0
+        for v_id in range(V):
+            self._atualizar(v_id)
+
+    def _atualizar(self, v_id: int):
+        """Move v_id para o balde correspondente ao seu estado atual (ou o retira, se não é crítico)."""
+        nova = self.viz_u[v_id] if self.estados[v_id] == 0 and not self.viz_2[v_id] else -1
+        antiga = self.chave[v_id]
+        if nova == antiga:
+            return
+
+        bit = self.bits[v_id]
+        if antiga >= 0:
+            self.baldes[antiga] ^= bit
+            if not self.baldes[antiga]:
+                self.ocupados ^= 1 << antiga
+        if nova >= 0:
+            if not self.baldes[nova]:
+                self.ocupados |= 1 << nova
+            self.baldes[nova] |= bit
+        self.chave[v_id] = nova
+
+    def atribuir(self, u_id: int, valor: int):
+        """Atualiza as contagens após busca.atribuir(u_id, valor)."""
+        estados = self.estados
+        viz_u = self.viz_u
+        self.mascara_u ^= self.bits[u_id]
+        for w_id in self.G[u_id]:
+            viz_u[w_id] -= 1
+            if valor == 2:
+                self.viz_2[w_id] += 1
+            if estados[w_id] == 0:
+                self._atualizar(w_id)
+        if valor == 0:
+            self._atualizar(u_id)
+
+    def desfazer(self, u_id: int, valor: int):
+        """Atualiza as contagens após busca.desfazer() ter removido a atribuição (u_id, valor)."""
+        estados = self.estados
+        viz_u = self.viz_u
+        self.mascara_u |= self.bits[u_id]
+        for w_id in self.G[u_id]:
+            viz_u[w_id] += 1
+            if valor == 2:
+                self.viz_2[w_id] -= 1
+            if estados[w_id] == 0:
+                self._atualizar(w_id)
+        if valor == 0:
+            self._atualizar(u_id)
+
+    def proximo(self) -> int:
+        """Próximo vértice de V_U a ramificar (deve haver algum)."""
+        livres = self.mascara_u & self.mascara_fixos
+        if not livres:
+            livres = self.mascara_u
+            ocupados = self.ocupados
+            if ocupados:
+                balde = self.baldes[(ocupados & -ocupados).bit_length() - 1]
+                critico = self.vertices[(balde & -balde).bit_length() - 1]
+                livres = (self.adj[critico] & self.mascara_u) or livres
+
+        return self.vertices[(livres & -livres).bit_length() - 1]
+
+
+def bb_recursive(solver: 'Solver',
+                 G: Dict[int, Set[int]],
+                 V: int,
+                 ordered_vertices: List[int],
+                 busca: EstadoBusca,
+                 list_index: int,
+                 is_lower_bound: bool,
+                 ordem: Optional[OrdemDinamica] = None):
+    """
+    Função recursiva principal (DFS) do Branch and Bound.
+    O Grafo (G) e os Estados (estados) são 0-based.
+
+    Esta função explora o espaço de busca, podando ramos inviáveis ou não-promissoros.
+    O estado é compartilhado por toda a busca: cada ramo atribui o vértice em 'busca'
+    e desfaz a atribuição ao retornar, sem copiar a lista de estados.
+
+    Args:
+        solver: Contexto da resolução (incumbente e valores tentados em cada vértice, solver.dominios).
+        G, V: Grafo e número de vértices.
+        ordered_vertices: Ordem de visitação dos vértices.
+        busca: Estado mutável da busca (estados, contadores, peso acumulado e trilha).
+        list_index: Índice do vértice atual a ser ramificado (u), igual ao número de vértices atribuídos.
+        ordem: Escolha dinâmica do vértice (OrdemDinamica). Se None, ramifica em ordered_vertices[list_index].
+    """
+    estados = busca.estados
+    estatisticas = solver.estatisticas
+
+    # Log do peso
+    #print(f"Melhor: {solver.melhor_peso}, Atual: {busca.peso} ")
+
+    # 1. CRITÉRIO DE PARADA: Solução Completa
+    # Se todos os vértices foram atribuídos (o índice passou do último vértice),
+    # o estado 'estados' é uma solução final.
+    if list_index >= V:
+        if busca.peso < solver.melhor_peso:
+            # Checagem Final: Garante que a solução completa é realmente viável.
+            # Apenas o último vértice atribuído (e sua vizinhança) ainda não foi verificado.
+            # (com ordem dinâmica, o último vértice da trilha)
+            u_anterior = None
+            if list_index > 0:
+                u_anterior = ordered_vertices[list_index - 1] if ordem is None else busca.trilha[-1]
+            is_valid_final = not busca.inviavel(u_anterior)
+
+            if is_valid_final:
+                solver.atualizar_incumbente(busca.peso, estados)
+
+                # Log de mudança de valor
+                # print(f"Peso atualizado: {solver.melhor_peso}")
+                return
+
+        estatisticas['folhas_rejeitadas'] += 1
+        return
+
+    # Passo 1: Poda Rápida (Verificação de Inviabilidade Imediata)
+    # Se o estado parcial for irreparavelmente inviável (ex: nó atribuído=0 sem vizinho=2 em V_A),
+    # o custo é infinito e o ramo é podado.
+    # Na raiz todos os vértices são verificados; nos demais nós, apenas o vértice atribuído pelo pai.
+    u_anterior = None
+    if list_index > 0:
+        u_anterior = ordered_vertices[list_index - 1] if ordem is None else busca.trilha[-1]
+    if busca.inviavel(u_anterior):
+        estatisticas['podas_inviabilidade'] += 1
+        return
+
+    # Limite de tempo ou de nós atingido: o nó fica aberto
+    if solver.parar():
+        solver.registrar_aberto(busca.peso)
+        return
+
+    if list_index > estatisticas['profundidade_maxima']:
+        estatisticas['profundidade_maxima'] = list_index
+
+    # Lower bound da relaxação LP nos nós de profundidade múltipla de solver.intervalo_lp
+    if solver.relaxacao is not None and list_index % solver.intervalo_lp == 0:
+        if solver.relaxacao.limite(estados) >= solver.melhor_peso:
+            estatisticas['podas_lp'] += 1
+            return
+
+    # 2. RAMIFICAÇÃO (Para o vértice atual 'u')
+    u_id = ordered_vertices[list_index] if ordem is None else ordem.proximo()  # ID do vértice (0-based)
+
+    # A ordem de ramificação (2, 1, 0) é uma heurística para encontrar bons bounds
+    # mais rapidamente, priorizando pesos mais altos.
+
+    valores = solver.dominios[u_id]
+    for value in valores:
+        new_weight = busca.peso + value
 
         # ⛔ PODA TRIVIAL E RÁPIDA: Custo Atual vs. Upper Bound
         # Se o custo parcial já excede o melhor encontrado, não há necessidade de prosseguir.
-        if new_weight >= BEST_WEIGHT:
+        if new_weight >= solver.melhor_peso:
+            estatisticas['podas_peso'] += 1
             continue
 
+        busca.atribuir(u_id, value)
+        if ordem is not None:
+            ordem.atribuir(u_id, value)
+
         if is_lower_bound:
             # O lower_bound é calculado apenas para o futuro V_U, por isso new_weight é somado separadamente
-            if lower_bound(G, new_estados, 0) + new_weight >= BEST_WEIGHT:
+            if busca.lower_bound() + new_weight >= solver.melhor_peso:
+                # O lower bound é heurístico: o ramo podado ainda pode conter solução melhor
+                estatisticas['podas_lower_bound'] += 1
+                solver.registrar_poda_heuristica(new_weight)
+                busca.desfazer()
+                if ordem is not None:
+                    ordem.desfazer(u_id, value)
                 continue
-            # if new_weight + lower_bound_future(G, new_estados, new_estados) >= BEST_WEIGHT:
+            # if new_weight + lower_bound_future(G, estados, estados) >= solver.melhor_peso:
             #    continue
 
-        bb_recursive(G, V, ordered_vertices, new_estados, new_weight, list_index + 1, is_lower_bound)
+        bb_recursive(solver, G, V, ordered_vertices, busca, list_index + 1, is_lower_bound, ordem)
+        busca.desfazer()
+        if ordem is not None:
+            ordem.desfazer(u_id, value)
 
+        # Busca interrompida: os valores ainda não tentados ficam abertos (o limite deste nó vale para eles)
+        if solver.interrompido:
+            if value != valores[-1]:
+                solver.registrar_aberto(busca.peso)
+            return
 
-def branch_and_bound(G: Dict[int, Set[int]], ordered_vertices: List[int], is_lower_bound: bool, is_upper_bound: bool) -> \
-Tuple[
-    Optional[List[int]], Optional[int]]:
+
+class BuscaIterativa:
     """
-    Função wrapper para inicializar o Branch and Bound (B&B).
-    Define o Upper Bound inicial e inicia a busca recursiva.
-    O Grafo (G) e os Vértices Ordenados são 0-based.
+    DFS do Branch and Bound com pilha explícita, sem recursão.
+
+    Reproduz exatamente as podas de bb_recursive (inviabilidade, peso >= incumbente e
+    lower bound), mas a profundidade da busca não depende do limite de recursão do Python.
+    A pilha é exposta para que a busca possa ser pausada (executar com limite_nos),
+    inspecionada e dividida em subproblemas (dividir). Os limites do solver (tempo_limite,
+    limite_nos) encerram a busca de vez, registrando os nós que ficaram abertos.
+
+    Atributos:
+        pilha (List[int]): pilha[d] é a posição, em solver.dominios[u], do próximo valor a ser
+                           tentado no nó de profundidade profundidade_inicial + d.
+                           O vértice desse nó é ordered_vertices[profundidade_inicial + d].
+        profundidade_inicial (int): Número de vértices já atribuídos em 'busca' ao criar a busca
+                                    (prefixo de ordered_vertices; 0 para a árvore completa).
+        concluida (bool): True quando toda a subárvore foi explorada.
+        nos_visitados (int): Nós filhos visitados até o momento (somando todas as chamadas de executar).
+    """
+
+    def __init__(self, solver: 'Solver', G: Dict[int, Set[int]], ordered_vertices: List[int], busca: EstadoBusca,
+                 is_lower_bound: bool):
+        self.solver = solver
+        self.G = G
+        self.V = len(ordered_vertices)
+        self.ordered_vertices = ordered_vertices
+        self.busca = busca
+        self.is_lower_bound = is_lower_bound
+        self.profundidade_inicial = len(busca.trilha)
+        self.pilha: List[int] = []
+        self.iniciada = False
+        self.concluida = False
+        self.nos_visitados = 0
+
+    def _entrar(self, profundidade: int) -> bool:
+        """
+        Processa a chegada a um nó (folha ou verificação de inviabilidade).
+
+        Returns:
+            bool: True se o nó foi empilhado para ramificação.
+        """
+        busca = self.busca
+        estatisticas = self.solver.estatisticas
+
+        # O nó inicial é verificado por completo: o prefixo pode ter sido atribuído sem checagens.
+        u_anterior = None
+        if profundidade > self.profundidade_inicial:
+            u_anterior = self.ordered_vertices[profundidade - 1]
+
+        # 1. CRITÉRIO DE PARADA: Solução Completa
+        if profundidade >= self.V:
+            if busca.peso < self.solver.melhor_peso and not busca.inviavel(u_anterior):
+                self.solver.atualizar_incumbente(busca.peso, busca.estados)
+            else:
+                estatisticas['folhas_rejeitadas'] += 1
+            return False
+
+        # 2. Poda Rápida (Verificação de Inviabilidade Imediata)
+        if busca.inviavel(u_anterior):
+            estatisticas['podas_inviabilidade'] += 1
+            return False
+
+        # 3. Lower bound da relaxação LP nos nós selecionados
+        solver = self.solver
+        if solver.relaxacao is not None and profundidade % solver.intervalo_lp == 0:
+            if solver.relaxacao.limite(busca.estados) >= solver.melhor_peso:
+                estatisticas['podas_lp'] += 1
+                return False
+
+        if profundidade > estatisticas['profundidade_maxima']:
+            estatisticas['profundidade_maxima'] = profundidade
+        self.pilha.append(0)
+        return True
+
+    def executar(self, limite_nos: Optional[int] = None) -> bool:
+        """
+        Executa (ou retoma) a busca.
+
+        Args:
+            limite_nos: Número máximo de nós filhos a visitar nesta chamada (None = sem limite).
+                        Ao atingir o limite a busca é pausada e pode ser retomada depois.
+
+        Returns:
+            bool: True se a busca terminou (concluída, ou interrompida pelos limites do solver,
+                  ver solver.interrompido), False se foi pausada.
+        """
+        if not self.iniciada:
+            self.iniciada = True
+            self._entrar(self.profundidade_inicial)
+
+        solver = self.solver
+        busca = self.busca
+        pilha = self.pilha
+        ordered_vertices = self.ordered_vertices
+        is_lower_bound = self.is_lower_bound
+        base = self.profundidade_inicial
+        dominios = solver.dominios
+        estatisticas = solver.estatisticas
+        nos = 0
+
+        while pilha:
+            if limite_nos is not None and nos >= limite_nos:
+                self.nos_visitados += nos
+                return False
+
+            topo = len(pilha) - 1
+            posicao = pilha[topo]
+            u_id = ordered_vertices[base + topo]
+            valores = dominios[u_id]
+
+            # Todos os valores do nó foram tentados: retrocede
+            if posicao >= len(valores):
+                pilha.pop()
+                if pilha:
+                    # Desfaz a atribuição feita pelo pai para chegar a este nó
+                    busca.desfazer()
+                continue
+
+            pilha[topo] = posicao + 1
+            value = valores[posicao]
+            new_weight = busca.peso + value
+
+            # ⛔ PODA TRIVIAL E RÁPIDA: Custo Atual vs. Upper Bound
+            if new_weight >= solver.melhor_peso:
+                estatisticas['podas_peso'] += 1
+                continue
+
+            busca.atribuir(u_id, value)
+
+            if is_lower_bound:
+                if busca.lower_bound() + new_weight >= solver.melhor_peso:
+                    estatisticas['podas_lower_bound'] += 1
+                    solver.registrar_poda_heuristica(new_weight)
+                    busca.desfazer()
+                    continue
+
+            nos += 1
+            if solver.parar():
+                # O filho recém-gerado e os ramos não tentados da pilha ficam abertos
+                solver.registrar_aberto(new_weight)
+                busca.desfazer()
+                self._encerrar()
+                self.nos_visitados += nos
+                return True
+
+            if not self._entrar(base + topo + 1):
+                busca.desfazer()
+
+        self.nos_visitados += nos
+        self.concluida = True
+        return True
+
+    def _encerrar(self):
+        """Esvazia a pilha após a interrupção, registrando no solver o limite de cada nó com ramos não tentados."""
+        busca = self.busca
+        dominios = self.solver.dominios
+
+        while self.pilha:
+            u_id = self.ordered_vertices[self.profundidade_inicial + len(self.pilha) - 1]
+            if self.pilha[-1] < len(dominios[u_id]):
+                self.solver.registrar_aberto(busca.peso)
+            self.pilha.pop()
+            if self.pilha:
+                busca.desfazer()
+
+    def dividir(self) -> List[List[Tuple[int, int]]]:
+        """
+        Retira da busca os ramos ainda não tentados do nó mais raso que os possui.
+
+        Os ramos retirados deixam de ser explorados por esta busca e são devolvidos como
+        subproblemas, cada um descrito pelo prefixo de atribuições (vértice, valor) que leva a ele.
+        Um subproblema pode ser resolvido aplicando o prefixo a um novo EstadoBusca e criando
+        outra BuscaIterativa sobre ele.
+
+        Returns:
+            List[List[Tuple[int, int]]]: Prefixos dos subproblemas (lista vazia se não há o que dividir).
+        """
+        estados = self.busca.estados
+
+        for topo, posicao in enumerate(self.pilha):
+            u_id = self.ordered_vertices[self.profundidade_inicial + topo]
+            valores = self.solver.dominios[u_id]
+            if posicao >= len(valores):
+                continue
+
+            # O nó de profundidade base + topo foi alcançado pelos primeiros base + topo vértices da trilha
+            prefixo = [(v_id, estados[v_id]) for v_id in self.busca.trilha[:self.profundidade_inicial + topo]]
+            self.pilha[topo] = len(valores)
+
+            return [prefixo + [(u_id, value)] for value in valores[posicao:]]
+
+        return []
+
+
+def _ir_para_prefixo(busca, ordered_vertices: List[int], base: int, prefixo: bytes):
+    """
+    Leva o estado da busca ao nó descrito por 'prefixo' (valores de ordered_vertices[base:]),
+    desfazendo apenas até o maior prefixo em comum com o nó atual.
+    """
+    estados = busca.estados
+    atual = len(busca.trilha) - base
+    comum = 0
+    limite = min(atual, len(prefixo))
+    while comum < limite and estados[ordered_vertices[base + comum]] == prefixo[comum]:
+        comum += 1
+
+    for _ in range(atual - comum):
+        busca.desfazer()
+
+    for i in range(comum, len(prefixo)):
+        busca.atribuir(ordered_vertices[base + i], prefixo[i])
+
+
+def bb_melhor_primeiro(solver: 'Solver', G: Dict[int, Set[int]], ordered_vertices: List[int], busca,
+                       is_lower_bound: bool, max_nos_abertos: int = 100000) -> int:
+    """
+    Branch and Bound com busca pelo melhor limite (best-first).
+
+    Cada nó aberto guarda um limite válido para toda a sua subárvore: o peso parcial, o limite do
+    pai ou, nas profundidades múltiplas de solver.intervalo_lp, o da relaxação LP. Os nós ficam em um heap ordenado por esse limite ou, com
+    is_lower_bound, por peso + lower bound (empates favorecem o nó mais profundo, para chegar
+    logo a soluções completas). Cada nó aberto é guardado de forma compacta: apenas os valores
+    atribuídos aos vértices de ordered_vertices, em bytes. O estado da busca é reposicionado de
+    um nó para o outro com _ir_para_prefixo.
+
+    Quando o heap passa de max_nos_abertos, a metade pior dos nós abertos é resolvida por DFS
+    (BuscaIterativa, com o mesmo is_lower_bound), o que limita a memória sem perder a otimalidade.
+
+    O lower bound de busca.lower_bound é heurístico: os nós descartados por ele são registrados no
+    solver com registrar_poda_heuristica, e os que ficam no heap na interrupção com registrar_aberto.
+
+    Args:
+        busca: Estado da busca (EstadoBusca ou EstadoBuscaBits). Com is_lower_bound, de preferência
+               com lower_bound_incremental, pois o lower bound é calculado para todo nó gerado.
+        is_lower_bound: Ordena e poda os nós abertos pelo lower bound.
+        max_nos_abertos: Número máximo de nós abertos mantidos no heap.
 
     Returns:
-        Tuple[Optional[List[int]], Optional[int]]: O melhor estado e o melhor peso encontrados.
+        int: Número de nós expandidos (incluindo os expandidos pelas DFS de descarga).
     """
     V = len(ordered_vertices)
-    global BEST_WEIGHT
-    global BEST_STATES
+    base = len(busca.trilha)
+    estatisticas = solver.estatisticas
+    poda_chave = 'podas_lower_bound' if is_lower_bound else 'podas_peso'
+    sequencia = 0
+    expandidos = 0
+
+    # Verificação completa do nó inicial
+    if busca.inviavel():
+        estatisticas['podas_inviabilidade'] += 1
+        return 0
 
-    if is_upper_bound:
-        # 1. Inicializa o Upper Bound (U) com a solução Gulosa Otimizada
-        # Uma boa solução inicial (U) é crucial para a eficácia das podas.
-        best_u_states, best_u = atribuicao_direta_gulosa(G, ordered_vertices)
+    if base >= V:
+        if busca.peso < solver.melhor_peso:
+            solver.atualizar_incumbente(busca.peso, busca.estados)
+        return 0
 
-        # Inicializa as variáveis globais do B&B
-        BEST_WEIGHT = best_u
-        BEST_STATES = best_u_states
+    def registrar_abertos(nos, registrar=solver.registrar_aberto):
+        # Menor limite entre os nós (chave, profundidade, sequência, prefixo, limite) não explorados
+        if nos:
+            registrar(min(no[4] for no in nos))
+
+    def limite_lp(profundidade: int, limite: float) -> float:
+        # Relaxação LP nos nós de profundidade múltipla de solver.intervalo_lp
+        if solver.relaxacao is not None and profundidade % solver.intervalo_lp == 0:
+            return max(limite, solver.relaxacao.limite(busca.estados))
+        return limite
+
+    limite = limite_lp(base, busca.peso)
+    chave = max(limite, busca.peso + busca.lower_bound()) if is_lower_bound else limite
+    abertos = [(chave, -base, sequencia, b'', limite)]
+
+    while abertos:
+        no = heapq.heappop(abertos)
+        chave, _, _, prefixo, limite_no = no
+
+        # O heap está ordenado pela chave: nenhum nó restante pode melhorar a solução
+        if chave >= solver.melhor_peso:
+            estatisticas[poda_chave] += len(abertos) + 1
+            if is_lower_bound:
+                registrar_abertos(abertos + [no], solver.registrar_poda_heuristica)
+            break
+
+        # Limite de tempo ou de nós atingido: este nó e os do heap ficam abertos
+        if solver.parar():
+            registrar_abertos(abertos + [no])
+            break
+
+        _ir_para_prefixo(busca, ordered_vertices, base, prefixo)
+        profundidade = base + len(prefixo)
+        u_id = ordered_vertices[profundidade]
+        expandidos += 1
+        if profundidade > estatisticas['profundidade_maxima']:
+            estatisticas['profundidade_maxima'] = profundidade
+
+        for value in solver.dominios[u_id]:
+            new_weight = busca.peso + value
+            if new_weight >= solver.melhor_peso:
+                estatisticas['podas_peso'] += 1
+                continue
 
-    # Inicializa o estado B&B (todos os vértices não atribuídos = None)
-    estados_iniciais = [None] * V
+            busca.atribuir(u_id, value)
+
+            # Os filhos são verificados ao serem gerados: o heap só guarda nós viáveis
+            if busca.inviavel(u_id):
+                estatisticas['podas_inviabilidade'] += 1
+            elif profundidade + 1 >= V:
+                solver.atualizar_incumbente(new_weight, busca.estados)
+            else:
+                limite = limite_lp(profundidade + 1, max(new_weight, limite_no))
+                chave = max(limite, new_weight + busca.lower_bound()) if is_lower_bound else limite
+                if limite >= solver.melhor_peso:
+                    estatisticas['podas_lp'] += 1
+                elif chave < solver.melhor_peso:
+                    sequencia += 1
+                    heapq.heappush(abertos, (chave, -(profundidade + 1), sequencia, prefixo + bytes((value,)),
+                                             limite))
+                else:
+                    estatisticas['podas_lower_bound'] += 1
+                    solver.registrar_poda_heuristica(limite)
+
+            busca.desfazer()
+
+        # Limite de memória: resolve por DFS a metade pior dos nós abertos
+        if len(abertos) > max_nos_abertos:
+            abertos.sort()  # Uma lista ordenada continua sendo um heap válido
+            piores = abertos[max_nos_abertos // 2:]
+            del abertos[max_nos_abertos // 2:]
+
+            for i, (chave, _, _, prefixo_pior, limite) in enumerate(piores):
+                if chave >= solver.melhor_peso:
+                    estatisticas[poda_chave] += 1
+                    if is_lower_bound:
+                        solver.registrar_poda_heuristica(limite)
+                    continue
+                _ir_para_prefixo(busca, ordered_vertices, base, prefixo_pior)
+                dfs = BuscaIterativa(solver, G, ordered_vertices, busca, is_lower_bound)
+                dfs.executar()
+                expandidos += dfs.nos_visitados
+
+                if solver.interrompido:
+                    # Os piores restantes e os do heap ficam abertos
+                    registrar_abertos(piores[i + 1:] + abertos)
+                    break
 
-    # Inicia a busca DFS (recursão)
-    bb_recursive(G, V, ordered_vertices, estados_iniciais, 0, 0, is_lower_bound)
+            if solver.interrompido:
+                break
 
-    return BEST_STATES, BEST_WEIGHT
+    # Devolve o estado à raiz da busca
+    _ir_para_prefixo(busca, ordered_vertices, base, b'')
 
+    return expandidos
 
-def dominacao(tecnica: str, arquivo: str, pasta: str, is_lower_bound: bool, is_upper_bound: bool, atribuicao_gulosa: bool, pastaImagens: str):
-    """Função principal que gerencia o fluxo de execução, mede o tempo e apresenta os resultados."""
-    print("---------------------------------------------------------")
-    print(f"Iniciando processamento\n{tecnica}\nArquivo: {arquivo}")
-    print("---------------------------------------------------------")
 
-    # 1. Carregamento e Ordenação do Grafo
-    _, extensao = os.path.splitext(arquivo)
-    local_arquivo = pasta + arquivo
-
-    # Diferença para indicar se o índice do grafo começa em 0 ou 1
-    # Chamando importar_base0 para arquivos que são 0-based (como o grafo-40-1-0.3.txt)
-    G, V, vertices_ordenados = importar_base0(local_arquivo)
-
-    # 2. PRÉ-PROCESSAMENTO: VERIFICAÇÃO DE VÉRTICES ISOLADOS
-    if vertices_isolados(G):
-        estados_peso_zero = [0] * V
-        # Levanta exceção, pois a DRT não é possível (Peso infinito)
-        adicionar_resultado(tecnica, is_lower_bound, is_upper_bound, arquivo, 0, 0, [])
-        plotar_grafico(G, estados_peso_zero, 0, arquivo, tecnica, is_lower_bound, is_upper_bound, pastaImagens)
-        print("O grafo contém vértices isolados e não pode ser dominado")
+# ======================================================================
+# B&B PARALELO (MULTIPROCESSAMENTO)
+# ======================================================================
+
+# Contexto de cada processo trabalhador, preenchido por _inicializar_trabalhador
+_TRABALHADOR = {}
+
+
+def _gerar_subproblemas(solver: 'Solver', ordered_vertices: List[int], busca, is_lower_bound: bool,
+                        profundidade_divisao: int, subproblemas: List[Tuple[int, List[int]]]):
+    """
+    Percorre a árvore até profundidade_divisao, com as mesmas podas de bb_recursive, e guarda
+    cada nó sobrevivente como subproblema (limite, valores atribuídos a ordered_vertices[:profundidade]).
+    Folhas encontradas antes dessa profundidade atualizam diretamente o incumbente.
+    """
+    profundidade = len(busca.trilha)
+    u_anterior = ordered_vertices[profundidade - 1] if profundidade > 0 else None
+
+    estatisticas = solver.estatisticas
+
+    if profundidade >= len(ordered_vertices):
+        if busca.peso < solver.melhor_peso and not busca.inviavel(u_anterior):
+            solver.atualizar_incumbente(busca.peso, busca.estados)
+        else:
+            estatisticas['folhas_rejeitadas'] += 1
+        return
+
+    if busca.inviavel(u_anterior):
+        estatisticas['podas_inviabilidade'] += 1
+        return
+
+    if profundidade >= profundidade_divisao:
+        limite = busca.peso + (busca.lower_bound() if is_lower_bound else 0)
+        subproblemas.append((limite, [busca.estados[v_id] for v_id in busca.trilha]))
         return
 
+    u_id = ordered_vertices[profundidade]
+    for value in solver.dominios[u_id]:
+        new_weight = busca.peso + value
+        if new_weight >= solver.melhor_peso:
+            estatisticas['podas_peso'] += 1
+            continue
+
+        busca.atribuir(u_id, value)
+        if is_lower_bound and busca.lower_bound() + new_weight >= solver.melhor_peso:
+            estatisticas['podas_lower_bound'] += 1
+            solver.registrar_poda_heuristica(new_weight)
+        else:
+            _gerar_subproblemas(solver, ordered_vertices, busca, is_lower_bound, profundidade_divisao, subproblemas)
+        busca.desfazer()
+
+
+def _inicializar_trabalhador(melhor_peso_compartilhado, nos_compartilhados, G: Dict[int, Set[int]],
+                             ordered_vertices: List[int], is_lower_bound: bool, representacao: str,
+                             dominios: List[List[int]], intervalo_sincronizacao: int,
+                             prazo: Optional[float], limite_nos: Optional[int], cronometrar: bool):
+    """
+    Executado uma vez em cada processo do pool: guarda o grafo, o incumbente e o contador de nós
+    compartilhados e os limites da busca (prazo em time.time(), comum a todos os processos).
+    """
+    _TRABALHADOR.update(melhor_peso=melhor_peso_compartilhado, nos=nos_compartilhados, G=G,
+                        ordered_vertices=ordered_vertices, is_lower_bound=is_lower_bound,
+                        representacao=representacao, intervalo_sincronizacao=intervalo_sincronizacao,
+                        prazo=prazo, limite_nos=limite_nos,
+                        solver=Solver(is_lower_bound=is_lower_bound, representacao=representacao,
+                                      cronometrar=cronometrar))
+    _TRABALHADOR['solver'].dominios = dominios
+
+
+def _sincronizar_incumbente(solver: 'Solver', melhor_local: List) -> None:
+    """
+    Troca o incumbente do processo com o compartilhado.
+
+    Se a busca local encontrou solução melhor que a compartilhada, ela é publicada; caso contrário
+    o incumbente local passa a valer o peso compartilhado (possivelmente encontrado por outro processo),
+    para que as podas locais usem o melhor incumbente global.
+
+    Também soma os nós visitados ao contador compartilhado; com limite_nos, o que resta do limite
+    global passa a ser o limite deste processo.
+
+    Args:
+        melhor_local: [melhor peso, melhores estados, nós já somados ao contador compartilhado].
+    """
+    # Solução encontrada desde a última sincronização
+    if solver.melhores_estados is not None and solver.melhor_peso < melhor_local[0]:
+        melhor_local[0] = solver.melhor_peso
+        melhor_local[1] = solver.melhores_estados
+    solver.melhores_estados = None
+
+    compartilhado = _TRABALHADOR['melhor_peso']
+    with compartilhado.get_lock():
+        if solver.melhor_peso < compartilhado.value:
+            compartilhado.value = solver.melhor_peso
+        else:
+            solver.melhor_peso = compartilhado.value
+
+    nos_compartilhados = _TRABALHADOR['nos']
+    with nos_compartilhados.get_lock():
+        nos_compartilhados.value += solver.nos - melhor_local[2]
+        total = nos_compartilhados.value
+    melhor_local[2] = solver.nos
+
+    if _TRABALHADOR['limite_nos'] is not None:
+        solver.definir_limite_nos(solver.nos + max(0, _TRABALHADOR['limite_nos'] - total))
+
+
+def _resolver_subproblema(prefixo: List[int]) -> Tuple[float, Optional[List[int]], bool, float, float,
+                                                        Dict[str, float]]:
+    """
+    Resolve, em um processo trabalhador, a subárvore definida por 'prefixo' com BuscaIterativa,
+    pausando a cada intervalo_sincronizacao nós para sincronizar o incumbente.
+
+    Returns:
+        Tuple[float, Optional[List[int]], bool, float, float, Dict[str, float]]: Melhor peso e estados
+            encontrados nesta subárvore (inf e None se nenhum foi melhor que o incumbente), se a
+            busca foi interrompida pelos limites, o menor limite dos nós que ficaram abertos, o dos
+            nós podados pelo lower bound heurístico e as estatísticas da busca.
+    """
+    G = _TRABALHADOR['G']
+    ordered_vertices = _TRABALHADOR['ordered_vertices']
+    is_lower_bound = _TRABALHADOR['is_lower_bound']
+    solver = _TRABALHADOR['solver']
+
+    # Tempo e nós que restam dos limites globais
+    prazo = _TRABALHADOR['prazo']
+    limite_nos = _TRABALHADOR['limite_nos']
+    solver.tempo_limite = max(0.0, prazo - time.time()) if prazo is not None else None
+    solver.limite_nos = max(0, limite_nos - _TRABALHADOR['nos'].value) if limite_nos is not None else None
+
+    solver.reiniciar()
+    solver.melhor_peso = _TRABALHADOR['melhor_peso'].value
+    melhor_local = [float('inf'), None, 0]
+
+    busca = criar_estado_busca(G, [None] * len(ordered_vertices), _TRABALHADOR['representacao'],
+                               lower_bound_incremental=is_lower_bound)
+    if solver.cronometrar:
+        busca = BuscaCronometrada(busca, solver.estatisticas)
+    for u_id, valor in zip(ordered_vertices, prefixo):
+        busca.atribuir(u_id, valor)
+
+    dfs = BuscaIterativa(solver, G, ordered_vertices, busca, is_lower_bound)
+    while not dfs.executar(limite_nos=_TRABALHADOR['intervalo_sincronizacao']):
+        _sincronizar_incumbente(solver, melhor_local)
+    _sincronizar_incumbente(solver, melhor_local)
+
+    return (melhor_local[0], melhor_local[1], solver.interrompido, solver._limite_abertos, solver._limite_podas,
+            solver.estatisticas)
+
+
+def bb_paralelo(solver: 'Solver', G: Dict[int, Set[int]], ordered_vertices: List[int], is_lower_bound: bool,
+                representacao: str = 'conjuntos', n_processos: Optional[int] = None,
+                profundidade_divisao: Optional[int] = None, intervalo_sincronizacao: int = 2000):
+    """
+    Branch and Bound em vários processos com incumbente compartilhado.
+
+    A árvore é dividida na profundidade 'profundidade_divisao' de ordered_vertices; cada nó
+    sobrevivente nessa profundidade vira um subproblema resolvido por um processo do pool.
+    O melhor peso fica em memória compartilhada (multiprocessing.Value), lida e atualizada pelos
+    trabalhadores a cada 'intervalo_sincronizacao' nós, de modo que todos podam contra o
+    incumbente global. O resultado é o mesmo ótimo da busca serial.
+
+    Usa e atualiza o incumbente de 'solver' (o upper bound inicial, se houver, deve estar
+    em solver.melhor_peso antes da chamada). Os limites do solver (tempo_limite, limite_nos)
+    valem para o conjunto dos processos.
+
+    Args:
+        n_processos: Número de processos (padrão: os.cpu_count()).
+        profundidade_divisao: Profundidade da divisão (padrão: menor k em que o produto dos tamanhos
+                              dos domínios de ordered_vertices[:k] é >= 8 * n_processos).
+        intervalo_sincronizacao: Nós visitados entre duas sincronizações do incumbente.
+    """
+    V = len(ordered_vertices)
+    n_processos = n_processos or os.cpu_count() or 1
+
+    if profundidade_divisao is None:
+        # Vértices com domínio unitário (fixados no pré-processamento) não dividem a árvore
+        profundidade_divisao, folhas = 0, 1
+        while folhas < 8 * n_processos and profundidade_divisao < V:
+            folhas *= len(solver.dominios[ordered_vertices[profundidade_divisao]])
+            profundidade_divisao += 1
+    profundidade_divisao = min(profundidade_divisao, V)
+
+    # 1. Divisão da árvore no processo principal
+    busca = criar_estado_busca(G, [None] * V, representacao, lower_bound_incremental=is_lower_bound)
+    subproblemas: List[Tuple[int, List[int]]] = []
+    _gerar_subproblemas(solver, ordered_vertices, busca, is_lower_bound, profundidade_divisao, subproblemas)
+
+    # Subproblemas mais promissores primeiro, para encontrar bons incumbentes cedo
+    subproblemas.sort(key=lambda item: item[0])
+    prefixos = [prefixo for limite, prefixo in subproblemas if limite < solver.melhor_peso]
+    solver.estatisticas['podas_lower_bound'] += len(subproblemas) - len(prefixos)
+    for limite, prefixo in subproblemas:
+        if limite >= solver.melhor_peso:
+            solver.registrar_poda_heuristica(sum(prefixo))
+
+    if not prefixos:
+        return
+
+    # 2. Resolução dos subproblemas em paralelo
+    melhor_peso_compartilhado = multiprocessing.Value('d', solver.melhor_peso)
+    nos_compartilhados = multiprocessing.Value('q', solver.nos)
+    prazo = time.time() + (solver._prazo - time.perf_counter()) if solver._prazo is not None else None
+    argumentos = (melhor_peso_compartilhado, nos_compartilhados, G, ordered_vertices, is_lower_bound, representacao,
+                  solver.dominios, intervalo_sincronizacao, prazo, solver.limite_nos, solver.cronometrar)
+
+    with multiprocessing.Pool(n_processos, initializer=_inicializar_trabalhador, initargs=argumentos) as pool:
+        for peso, estados, interrompido, limite_abertos, limite_podas, estatisticas in \
+                pool.imap_unordered(_resolver_subproblema, prefixos):
+            solver.acumular_estatisticas(estatisticas)
+            if estados is not None and peso < solver.melhor_peso:
+                solver.atualizar_incumbente(int(peso), estados)
+            if interrompido:
+                solver.interrompido = True
+            solver.registrar_aberto(limite_abertos)
+            solver.registrar_poda_heuristica(limite_podas)
+
+    solver.nos = nos_compartilhados.value
+
+
+# ======================================================================
+# MILP EXATO (HiGHS)
+# ======================================================================
+
+def resolver_milp(solver: 'Solver', G: Dict[int, Set[int]]):
+    """
+    Resolve formulacao_drt com o MILP do HiGHS (scipy.optimize.milp), como alternativa exata ao B&B.
+
+    A interface do scipy não aceita uma solução inicial: o incumbente do solver (a solução
+    gulosa) entra como corte soma(x_v + 2 y_v) <= melhor_peso e continua sendo o resultado se o
+    HiGHS não encontrar nada melhor. Vértices com domínio reduzido (solver.dominios) têm as
+    variáveis correspondentes fixadas em 0. Os limites do solver viram time_limit e node_limit;
+    na interrupção, o dual bound do HiGHS é o lower bound provado.
+
+    A solução do HiGHS é conferida com validar_solucao_final antes de substituir o incumbente.
+    """
+    V = len(G)
     if V == 0:
-        print("Erro: Grafo não carregado ou vazio.")
+        # Grafo vazio: a atribuição vazia (peso 0), como na busca do B&B
+        if solver.melhor_peso > 0:
+            solver.atualizar_incumbente(0, [])
         return
 
-    # 3. Execução e Medição de Tempo
-    start_time = time.perf_counter()
+    from scipy.optimize import Bounds, LinearConstraint, milp
+
+    c, A_ub, b_ub = formulacao_drt(G)
+    restricoes = [LinearConstraint(A_ub, -np.inf, b_ub)]
+    if solver.melhores_estados is not None:
+        restricoes.append(LinearConstraint(c.reshape(1, -1), -np.inf, solver.melhor_peso))
+
+    superior = np.ones(2 * V)
+    for v_id, valores in enumerate(solver.dominios):
+        superior[v_id] = 1 in valores
+        superior[V + v_id] = 2 in valores
+
+    opcoes = {}
+    if solver.tempo_limite is not None:
+        opcoes['time_limit'] = max(0.0, solver._prazo - time.perf_counter())
+    if solver.limite_nos is not None:
+        opcoes['node_limit'] = solver.limite_nos
+
+    resultado = milp(c, integrality=np.ones(2 * V), bounds=Bounds(np.zeros(2 * V), superior),
+                     constraints=restricoes, options=opcoes)
+    solver.nos = int(getattr(resultado, 'mip_node_count', 0) or 0)
+
+    if resultado.x is not None:
+        estados = estados_de_variaveis(resultado.x, V)
+        peso = sum(estados)
+        if not validar_solucao_final(G, estados):
+            print("⚠️ A solução do MILP não passou em validar_solucao_final; mantido o incumbente.")
+        elif peso < solver.melhor_peso:
+            solver.atualizar_incumbente(peso, estados)
+
+    # status 1: limite de tempo ou de nós atingido
+    if resultado.status == 1:
+        solver.interrompido = True
+        limite = getattr(resultado, 'mip_dual_bound', None)
+        solver.registrar_aberto(limite - 1e-6 if limite is not None and np.isfinite(limite) else 0)
+
+
+# ======================================================================
+# DECOMPOSIÇÃO EM COMPONENTES CONEXAS
+# ======================================================================
+
+def componentes_conexas(G: Dict[int, Set[int]]) -> List[List[int]]:
+    """
+    Componentes conexas de G (busca em largura).
+
+    Returns:
+        List[List[int]]: Vértices de cada componente, em ordem crescente; as componentes
+                         aparecem na ordem do seu menor vértice.
+    """
+    visitados = set()
+    componentes = []
+
+    for inicio in sorted(G):
+        if inicio in visitados:
+            continue
+        visitados.add(inicio)
+        componente = [inicio]
+        fila = [inicio]
+        while fila:
+            u = fila.pop()
+            for w in G[u]:
+                if w not in visitados:
+                    visitados.add(w)
+                    componente.append(w)
+                    fila.append(w)
+        componentes.append(sorted(componente))
+
+    return componentes
+
+
+def subgrafo_componente(G: Dict[int, Set[int]], vertices: List[int], ordered_vertices: List[int]) -> \
+        Tuple[Dict[int, Set[int]], List[int]]:
+    """
+    Reindexa uma componente para 0..k-1 (o vértice vertices[i] passa a ser i).
+
+    Returns:
+        Tuple[Dict[int, Set[int]], List[int]]: O grafo da componente e ordered_vertices restrita
+                                               a ela (mesma ordem relativa), já reindexados.
+    """
+    local = {v: i for i, v in enumerate(vertices)}
+    G_local = {local[v]: {local[w] for w in G[v]} for v in vertices}
+    ordered_local = [local[v] for v in ordered_vertices if v in local]
+    return G_local, ordered_local
+
+
+def solucao_trivial(G: Dict[int, Set[int]]) -> Optional[Tuple[List[int], int]]:
+    """
+    Solução ótima em forma fechada para componentes conexas triviais:
+    K2 (peso 2: os dois vértices com 1) e estrela K1,n com n >= 2 (peso 3: centro com 2
+    e uma folha com 1, que dominam totalmente todos os vértices).
+
+    Returns:
+        Optional[Tuple[List[int], int]]: Estados e peso ótimos, ou None se G não é K2 nem estrela.
+    """
+    V = len(G)
+    if V == 2:
+        return [1, 1], 2
+
+    if V < 3:
+        return None
+
+    centro = max(G, key=lambda v: len(G[v]))
+    if len(G[centro]) != V - 1 or any(len(G[v]) != 1 for v in G if v != centro):
+        return None
+
+    estados = [0] * V
+    estados[centro] = 2
+    estados[min(G[centro])] = 1
+    return estados, 3
+
 
-    # REINICIALIZAÇÃO
-    global BEST_WEIGHT
-    global BEST_STATES
-    BEST_WEIGHT = float('inf')  # Reset para o B&B começar do zero
-    BEST_STATES = None
+def _resolver_componente(argumentos: Tuple) -> Tuple[Optional[List[int]], float, float, bool, bool, Dict[str, float]]:
+    """
+    Resolve uma componente com um Solver próprio (também usado como tarefa do pool).
+
+    Returns:
+        Tuple: (estados, peso, limite_inferior, otimo_provado, interrompido, estatisticas) do Solver.
+    """
+    configuracao, G, ordered_vertices, tempo_limite, limite_nos = argumentos
+    solver = Solver(tempo_limite=tempo_limite, limite_nos=limite_nos, **configuracao)
+    solver.resolver(G, ordered_vertices)
+    return (solver.melhores_estados, solver.melhor_peso, solver.limite_inferior, solver.otimo_provado,
+            solver.interrompido, solver.estatisticas)
+
+
+# ======================================================================
+# SOLVER (CONTEXTO DE RESOLUÇÃO REENTRANTE)
+# ======================================================================
+
+class Solver:
+    """
+    Contexto de uma resolução de Dominação Romana Total: configuração, incumbente e estatísticas.
+
+    Substitui as antigas variáveis globais BEST_WEIGHT / BEST_STATES: cada Solver tem o próprio
+    incumbente, portanto várias resoluções podem rodar no mesmo processo (inclusive em threads
+    diferentes, uma por Solver). Grafos carregados e máscaras de bits ficam em cache e são
+    reaproveitados entre chamadas do mesmo Solver.
+
+    Com decompor=True, cada componente conexa de G é resolvida por um Solver próprio (mesma
+    configuração, incumbente próprio), e os pesos e estados ótimos são somados e combinados: a
+    árvore de busca passa do produto das árvores das componentes para a soma delas. Componentes
+    K2 e estrelas recebem a solução em forma fechada (solucao_trivial), sem busca.
+
+    Com tempo_limite ou limite_nos a busca é interrompida ao atingir o limite, mantendo o
+    incumbente. Nesse caso os motores registram o limite (peso parcial) dos nós ainda abertos,
+    e limite_inferior passa a ser o menor deles: um lower bound provado para o ótimo.
+
+    O lower bound de is_lower_bound é heurístico: se ele podou algum ramo que ainda poderia ter
+    solução melhor, a busca não prova nada sobre esses ramos. Nesse caso só a relaxação LP da
+    raiz (RelaxacaoLP) pode provar a otimalidade; se ela não alcança o incumbente,
+    limite_inferior, gap e otimo_provado ficam None (não determinados).
+
+    Atributos:
+        melhor_peso (float): Peso do incumbente (inf se não há solução).
+        melhores_estados (Optional[List[int]]): Estados do incumbente.
+        nos (int): Nós visitados na última resolução.
+        interrompido (bool): True se a última resolução parou por tempo_limite ou limite_nos.
+        limite_inferior (Optional[float]): Lower bound global provado (igual a melhor_peso se a busca
+                                           terminou sem podas heurísticas; None se não determinado).
+        gap (Optional[float]): Gap relativo (melhor_peso - limite_inferior) / melhor_peso
+                               (None se não há incumbente ou se limite_inferior é None).
+        otimo_provado (Optional[bool]): True se o incumbente é comprovadamente ótimo
+                                        (None se não determinado).
+        estatisticas (Dict[str, float]): Estatísticas da última resolução: nós expandidos, podas por
+                                         motivo, folhas rejeitadas, profundidade máxima, vértices fixados,
+                                         melhorias do incumbente e tempos (ver COLUNAS_ESTATISTICAS).
+        dominios (List[List[int]]): Valores tentados em cada vértice na última resolução
+                                    (ordem_ramificacao, ou menos valores com reduzir=True).
+        reducoes (Optional[Reducoes]): Reduções aplicadas na última resolução (com reduzir=True).
+        resultados (List[Tuple]): Registros de dominacao (mesmo formato de RESULTADOS).
+    """
+
+    def __init__(self, is_lower_bound: bool = False, is_upper_bound: bool = False, motor: str = 'recursivo',
+                 representacao: str = 'conjuntos', ordem_ramificacao: Optional[List[int]] = None,
+                 max_nos_abertos: int = 100000, n_processos: Optional[int] = None,
+                 tempo_limite: Optional[float] = None, limite_nos: Optional[int] = None,
+                 cronometrar: bool = False, reduzir: bool = False, decompor: bool = False,
+                 componentes_em_paralelo: bool = False, ordem_dinamica: bool = False,
+                 desempate: Union[str, Callable[[Dict[int, Set[int]], List[int]], List[int]]] = 'ordem',
+                 intervalo_lp: Optional[int] = None, tempo_busca_local: Optional[float] = None,
+                 inicios_grasp: Optional[int] = None, alfa_grasp: float = 0.2,
+                 resultados: Optional[List[Tuple]] = None, plotagem: Optional[Callable] = plotar_grafico):
+        """
+        Args:
+            is_lower_bound: Poda pelo lower bound (heurístico: ver limite_inferior e otimo_provado).
+            is_upper_bound: Inicializa o incumbente com atribuicao_direta_gulosa.
+            motor: 'recursivo' (bb_recursive), 'iterativo' (BuscaIterativa, pilha explícita,
+                   sem limite de profundidade), 'melhor_primeiro' (bb_melhor_primeiro, heap de
+                   nós abertos ordenado pelo limite de cada nó), 'paralelo' (bb_paralelo, vários
+                   processos com incumbente compartilhado) ou 'milp' (resolver_milp, HiGHS, que
+                   sempre parte da solução gulosa).
+            representacao: 'conjuntos' ou 'bits' (vizinhanças e classes de valor como máscaras inteiras).
+            ordem_ramificacao: Ordem dos valores tentados em cada vértice (padrão: BRANCHING_ORDER).
+            max_nos_abertos: Limite de nós abertos do motor 'melhor_primeiro'.
+            n_processos: Número de processos do motor 'paralelo' (padrão: os.cpu_count()).
+            tempo_limite: Tempo máximo da busca, em segundos (None = sem limite).
+            limite_nos: Número máximo de nós visitados (None = sem limite). No motor 'paralelo'
+                        o limite é global, somado entre os processos a cada sincronização.
+            cronometrar: Mede o tempo gasto em lower_bound e na verificação de viabilidade
+                         (BuscaCronometrada). Desligado por padrão, pois a medição custa tempo por nó.
+            reduzir: Aplica reducoes_drt antes da busca (vértices fixados e domínios reduzidos).
+            decompor: Resolve cada componente conexa separadamente e combina as soluções.
+            componentes_em_paralelo: Com decompor, resolve as componentes não triviais em um pool
+                                     de n_processos processos (ignorado no motor 'paralelo', que já
+                                     usa vários processos em cada componente).
+            ordem_dinamica: Escolhe o vértice de cada nó pelo estado da busca (OrdemDinamica) em vez
+                            de seguir ordered_vertices. Disponível apenas no motor 'recursivo'.
+            desempate: Desempate da ordem dinâmica: nome em DESEMPATES ou função
+                       (G, ordered_vertices) -> vértices em ordem de preferência.
+            intervalo_lp: Calcula o lower bound da relaxação LP (RelaxacaoLP) na raiz e nos nós cuja
+                          profundidade é múltipla de intervalo_lp (None = desligado). Disponível nos
+                          motores 'recursivo', 'iterativo' e 'melhor_primeiro'; cada LP custa
+                          milissegundos, então valores maiores compensam nos grafos em que a poda
+                          não paga o custo.
+            tempo_busca_local: Melhora a solução gulosa inicial com busca_local por até esse número
+                               de segundos (None = desligado).
+            inicios_grasp: Número de inícios de grasp (em n_processos processos) usados para apertar o
+                           incumbente inicial (None = desligado). Os pesos de cada início ficam em
+                           pesos_grasp.
+            alfa_grasp: Tamanho relativo da lista restrita de candidatos do GRASP.
+            resultados: Lista onde dominacao acrescenta os registros (padrão: nova lista).
+            plotagem: Função chamada por dominacao com os argumentos de plotar_grafico para gerar a
+                      imagem da solução (padrão: plotar_grafico, no próprio processo; FilaPlotagem.enviar
+                      gera em segundo plano). None desliga as imagens.
+        """
+        self.is_lower_bound = is_lower_bound
+        self.is_upper_bound = is_upper_bound
+        self.motor = motor
+        self.representacao = representacao
+        self.ordem_ramificacao = list(ordem_ramificacao if ordem_ramificacao is not None else BRANCHING_ORDER)
+        self.max_nos_abertos = max_nos_abertos
+        self.n_processos = n_processos
+        self.tempo_limite = tempo_limite
+        self.limite_nos = limite_nos
+        self.cronometrar = cronometrar
+        self.reduzir = reduzir
+        self.decompor = decompor
+        self.componentes_em_paralelo = componentes_em_paralelo
+        self.ordem_dinamica = ordem_dinamica
+        self.desempate = desempate
+        self.intervalo_lp = intervalo_lp
+        self.tempo_busca_local = tempo_busca_local
+        self.inicios_grasp = inicios_grasp
+        self.alfa_grasp = alfa_grasp
+        self.relaxacao: Optional[RelaxacaoLP] = None
+        self.dominios: Optional[List[List[int]]] = None
+        self.reducoes: Optional[Reducoes] = None
+        self.resultados = resultados if resultados is not None else []
+        self.plotagem = plotagem
+
+        self._grafos: Dict[str, Tuple[Dict[int, Set[int]], int, List[int]]] = {}
+        self._mascaras: Dict[int, Tuple[Dict[int, Set[int]], List[int]]] = {}
+
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta o incumbente e as estatísticas (o cache de grafos é mantido) e reinicia os limites."""
+        self.melhor_peso = float('inf')
+        self.melhores_estados = None
+        self.estatisticas = {'nos_expandidos': 0, 'podas_inviabilidade': 0, 'podas_peso': 0, 'podas_lower_bound': 0,
+                             'podas_lp': 0, 'folhas_rejeitadas': 0, 'profundidade_maxima': 0,
+                             'vertices_fixados': 0, 'melhorias_incumbente': 0,
+                             'tempo_lower_bound': 0.0 if self.cronometrar else None,
+                             'tempo_viabilidade': 0.0 if self.cronometrar else None,
+                             'tempo_lp': 0.0, 'tempo_total': 0.0}
+
+        self.pesos_grasp: Optional[List[float]] = None
+        self.nos = 0
+        self.interrompido = False
+        self.limite_inferior = float('inf')
+        self.gap = None
+        self.otimo_provado = False
+        self._limite_abertos = float('inf')
+        self._limite_podas = float('inf')
+        self._prazo = time.perf_counter() + self.tempo_limite if self.tempo_limite is not None else None
+        self._proxima_verificacao = 0 if self.tem_limites else float('inf')
+
+    @property
+    def tem_limites(self) -> bool:
+        """True se a busca pode ser interrompida (tempo_limite ou limite_nos)."""
+        return self.tempo_limite is not None or self.limite_nos is not None
+
+    def parar(self) -> bool:
+        """
+        Conta um nó visitado e indica se a busca deve ser interrompida.
+        O relógio é consultado no máximo a cada 1024 nós.
+        """
+        self.nos += 1
+        if self.nos < self._proxima_verificacao:
+            return False
+        return self._verificar_limites()
+
+    def _verificar_limites(self) -> bool:
+        if self.limite_nos is not None and self.nos >= self.limite_nos:
+            self.interrompido = True
+        elif self._prazo is not None and time.perf_counter() >= self._prazo:
+            self.interrompido = True
+
+        if self.interrompido:
+            self._proxima_verificacao = 0
+            return True
+
+        self._proxima_verificacao = self.nos + 1024 if self._prazo is not None else float('inf')
+        if self.limite_nos is not None:
+            self._proxima_verificacao = min(self._proxima_verificacao, self.limite_nos)
+        return False
+
+    def definir_limite_nos(self, limite_nos: Optional[int]):
+        """Altera limite_nos durante a busca (usado pelo motor paralelo para repartir o limite global)."""
+        self.limite_nos = limite_nos
+        if limite_nos is not None:
+            self._proxima_verificacao = min(self._proxima_verificacao, limite_nos)
+
+    def acumular_estatisticas(self, estatisticas: Dict[str, float]):
+        """Soma as estatísticas de outra busca (processo do motor paralelo) às deste Solver."""
+        for chave, valor in estatisticas.items():
+            if valor is None or chave in ('melhorias_incumbente', 'tempo_total'):
+                continue
+            if chave == 'profundidade_maxima':
+                self.estatisticas[chave] = max(self.estatisticas[chave], valor)
+            elif self.estatisticas.get(chave) is not None:
+                self.estatisticas[chave] += valor
+
+    def registrar_aberto(self, limite: float):
+        """
+        Registra o limite de um nó que ficou sem explorar na interrupção. O limite deve valer para
+        toda a subárvore do nó: o peso parcial, o limite da relaxação LP ou o dual bound do MILP.
+        """
+        if limite < self._limite_abertos:
+            self._limite_abertos = limite
+
+    def registrar_poda_heuristica(self, limite: float):
+        """Registra o limite (peso parcial) de um nó podado pelo lower bound heurístico (busca.lower_bound)."""
+        if limite < self._limite_podas:
+            self._limite_podas = limite
+
+    def _finalizar_limites(self, G: Dict[int, Set[int]]):
+        """Calcula limite_inferior, gap e otimo_provado ao fim da resolução."""
+        limite = self._limite_abertos
+        podas_heuristicas = self._limite_podas < self.melhor_peso
+
+        if podas_heuristicas or (self.relaxacao is not None and limite < self.melhor_peso):
+            # A relaxação LP da raiz é um lower bound válido para o problema todo
+            if self.relaxacao is None:
+                self.relaxacao = RelaxacaoLP(G)
+            raiz = self.relaxacao.limite([None] * self.relaxacao.V)
+            if podas_heuristicas:
+                # Sem a relaxação, os ramos podados não têm limite melhor que o peso parcial
+                limite = raiz if raiz >= self.melhor_peso else None
+            else:
+                limite = max(limite, raiz)
+
+        if limite is None:
+            self.limite_inferior, self.gap, self.otimo_provado = None, None, None
+            return
+
+        # Os pesos são inteiros: o limite dos nós abertos pode ser arredondado para cima
+        self.limite_inferior = min(self.melhor_peso, math.ceil(limite)) \
+            if limite != float('inf') else self.melhor_peso
+
+        if self.melhores_estados is None:
+            self.gap = None
+            self.otimo_provado = False
+        else:
+            self.gap = (self.melhor_peso - self.limite_inferior) / self.melhor_peso if self.melhor_peso > 0 else 0.0
+            self.otimo_provado = self.limite_inferior >= self.melhor_peso
+
+    def atualizar_incumbente(self, peso: int, estados: List[Optional[int]]):
+        """Registra uma nova melhor solução (guarda uma cópia de 'estados')."""
+        self.melhor_peso = peso
+        self.melhores_estados = list(estados)
+        self.estatisticas['melhorias_incumbente'] += 1
+
+    def carregar_grafo(self, caminho: str) -> Tuple[Dict[int, Set[int]], int, List[int]]:
+        """importar_grafo com cache por caminho: as várias técnicas de um mesmo arquivo leem o grafo uma vez."""
+        if caminho not in self._grafos:
+            self._grafos[caminho] = importar_grafo(caminho)
+        return self._grafos[caminho]
+
+    def _mascaras_bits(self, G: Dict[int, Set[int]]) -> List[int]:
+        # O próprio G é guardado junto, para que id(G) não seja reutilizado por outro grafo
+        if id(G) not in self._mascaras:
+            self._mascaras[id(G)] = (G, grafo_para_bits(G))
+        return self._mascaras[id(G)][1]
+
+    def _configuracao(self) -> Dict:
+        """Argumentos do construtor que reproduzem a configuração de busca deste Solver (sem limites)."""
+        return dict(is_lower_bound=self.is_lower_bound, is_upper_bound=self.is_upper_bound, motor=self.motor,
+                    representacao=self.representacao, ordem_ramificacao=self.ordem_ramificacao,
+                    max_nos_abertos=self.max_nos_abertos, n_processos=self.n_processos,
+                    cronometrar=self.cronometrar, reduzir=self.reduzir, ordem_dinamica=self.ordem_dinamica,
+                    desempate=self.desempate, intervalo_lp=self.intervalo_lp,
+                    tempo_busca_local=self.tempo_busca_local, inicios_grasp=self.inicios_grasp,
+                    alfa_grasp=self.alfa_grasp)
+
+    def _resolver_componentes(self, G: Dict[int, Set[int]], ordered_vertices: List[int],
+                              componentes: List[List[int]], inicio: float):
+        """
+        Resolve cada componente com um Solver próprio e combina os resultados neste Solver.
+
+        Em série, cada componente recebe o tempo e os nós que sobraram das anteriores; no pool,
+        todas recebem o tempo restante e limite_nos vale para cada componente.
+        """
+        V = len(G)
+        configuracao = self._configuracao()
+        resultados: Dict[int, Tuple] = {}
+        tarefas = []
+
+        for indice, vertices in enumerate(componentes):
+            G_local, ordered_local = subgrafo_componente(G, vertices, ordered_vertices)
+            trivial = solucao_trivial(G_local)
+            if len(vertices) == 1:
+                # Vértice isolado: a DRT não é possível
+                resultados[indice] = (None, float('inf'), float('inf'), False, False, {})
+            elif trivial is not None:
+                estados, peso = trivial
+                resultados[indice] = (estados, peso, peso, True, False, {})
+            else:
+                tarefas.append((indice, G_local, ordered_local))
+
+        def restantes() -> Tuple[Optional[float], Optional[int]]:
+            tempo = max(0.0, self._prazo - time.perf_counter()) if self._prazo is not None else None
+            nos = max(0, self.limite_nos - self.nos) if self.limite_nos is not None else None
+            return tempo, nos
+
+        if self.componentes_em_paralelo and self.motor != 'paralelo' and len(tarefas) > 1:
+            tempo, nos = restantes()
+            with multiprocessing.Pool(min(self.n_processos or os.cpu_count() or 1, len(tarefas))) as pool:
+                respostas = pool.map(_resolver_componente,
+                                     [(configuracao, G_local, ordered_local, tempo, nos)
+                                      for _, G_local, ordered_local in tarefas])
+            for (indice, _, _), resposta in zip(tarefas, respostas):
+                resultados[indice] = resposta
+                self.nos += resposta[5]['nos_expandidos']
+        else:
+            for indice, G_local, ordered_local in tarefas:
+                tempo, nos = restantes()
+                resultados[indice] = _resolver_componente((configuracao, G_local, ordered_local, tempo, nos))
+                self.nos += resultados[indice][5]['nos_expandidos']
+
+        # Combinação: pesos e limites inferiores somados, estados levados de volta aos índices de G
+        estados_globais = [0] * V
+        peso_total, limite_total, otimo = 0, 0, True
+        for indice, vertices in enumerate(componentes):
+            estados, peso, limite_inferior, otimo_provado, interrompido, estatisticas = resultados[indice]
+            self.acumular_estatisticas({chave: valor for chave, valor in estatisticas.items()
+                                        if chave != 'nos_expandidos'})
+            self.estatisticas['melhorias_incumbente'] += estatisticas.get('melhorias_incumbente', 0)
+            self.interrompido = self.interrompido or interrompido
+            # Um limite não determinado em uma componente deixa o total não determinado
+            limite_total = None if limite_total is None or limite_inferior is None else limite_total + limite_inferior
+            otimo = otimo and otimo_provado
+            if estados is None:
+                estados_globais = None
+            elif estados_globais is not None:
+                peso_total += peso
+                for i, v in enumerate(vertices):
+                    estados_globais[v] = estados[i]
+
+        self.limite_inferior = limite_total
+        if estados_globais is None:
+            self.melhor_peso, self.melhores_estados = float('inf'), None
+            self.gap, self.otimo_provado = None, False
+        elif limite_total is None:
+            self.melhor_peso, self.melhores_estados = peso_total, estados_globais
+            self.gap, self.otimo_provado = None, None
+        else:
+            self.melhor_peso, self.melhores_estados = peso_total, estados_globais
+            self.gap = (peso_total - limite_total) / peso_total if peso_total > 0 else 0.0
+            self.otimo_provado = otimo
+
+        self.dominios, self.reducoes = None, None
+        self.estatisticas['nos_expandidos'] = self.nos
+        self.estatisticas['tempo_total'] = time.perf_counter() - inicio
+
+    def resolver(self, G: Dict[int, Set[int]], ordered_vertices: List[int]) -> \
+            Tuple[Optional[List[int]], Optional[int]]:
+        """
+        Executa o Branch and Bound (B&B) com a configuração do Solver.
+        Define o Upper Bound inicial e inicia a busca com o motor escolhido.
+        O Grafo (G) e os Vértices Ordenados são 0-based.
+
+        Ao final, limite_inferior, gap e otimo_provado descrevem a qualidade do incumbente.
+
+        Returns:
+            Tuple[Optional[List[int]], Optional[int]]: O melhor estado e o melhor peso encontrados.
+        """
+        V = len(ordered_vertices)
+        self.reiniciar()
+        inicio = time.perf_counter()
+
+        if self.decompor:
+            # Uma única componente não trivial segue pelo caminho normal
+            componentes = componentes_conexas(G)
+            if len(componentes) > 1 or (V > 0 and solucao_trivial(G) is not None):
+                self._resolver_componentes(G, ordered_vertices, componentes, inicio)
+                return self.melhores_estados, self.melhor_peso
+
+        adj = self._mascaras_bits(G) if self.representacao == 'bits' else None
+
+        if self.is_upper_bound or self.motor == 'milp':
+            # 1. Inicializa o Upper Bound (U) com a solução Gulosa Otimizada
+            # Uma boa solução inicial (U) é crucial para a eficácia das podas.
+            if self.representacao == 'bits':
+                best_u_states, best_u = atribuicao_direta_gulosa_bits(G, ordered_vertices, adj)
+            else:
+                best_u_states, best_u = atribuicao_direta_gulosa(G, ordered_vertices)
+
+            # Um incumbente inicial mais apertado poda mais a árvore
+            if self.tempo_busca_local is not None:
+                best_u_states, best_u = busca_local(G, best_u_states, self.tempo_busca_local)
+
+            if self.inicios_grasp:
+                resultado_grasp = grasp(G, self.inicios_grasp, self.alfa_grasp, n_processos=self.n_processos,
+                                        tempo_busca_local=self.tempo_busca_local)
+                self.pesos_grasp = resultado_grasp.pesos
+                if resultado_grasp.peso < best_u:
+                    best_u_states, best_u = resultado_grasp.estados, resultado_grasp.peso
+
+            self.melhor_peso = best_u
+            self.melhores_estados = best_u_states
+
+        # 2. Presolve: vértices fixados vão para o início da ordem e os domínios são reduzidos
+        self.dominios = [self.ordem_ramificacao] * V
+        self.reducoes = None
+        if self.reduzir:
+            self.reducoes = reducoes_drt(G)
+            ordered_vertices, self.dominios = aplicar_reducoes(ordered_vertices, self.reducoes, self.ordem_ramificacao)
+            self.estatisticas['vertices_fixados'] = len(self.reducoes.fixados)
+
+        if self.ordem_dinamica and self.motor != 'recursivo':
+            raise ValueError(f"A ordem dinâmica não é suportada pelo motor '{self.motor}'")
+
+        if self.intervalo_lp and self.motor in ('paralelo', 'milp'):
+            raise ValueError(f"A relaxação LP (intervalo_lp) não é suportada pelo motor '{self.motor}'")
+
+        self.relaxacao = RelaxacaoLP(G) if self.intervalo_lp else None
+
+        if self.motor == 'milp':
+            resolver_milp(self, G)
+        elif self.motor == 'paralelo':
+            # Cada processo cria o próprio estado de busca
+            bb_paralelo(self, G, ordered_vertices, self.is_lower_bound, self.representacao, self.n_processos)
+        else:
+            # Inicializa o estado B&B (todos os vértices não atribuídos = None)
+            # Com lower bound, a demanda é mantida incrementalmente pelo próprio estado
+            busca = criar_estado_busca(G, [None] * V, self.representacao,
+                                       lower_bound_incremental=self.is_lower_bound, adj=adj)
+            if self.cronometrar:
+                busca = BuscaCronometrada(busca, self.estatisticas)
+
+            if self.motor == 'recursivo':
+                # Inicia a busca DFS (recursão)
+                ordem = None
+                if self.ordem_dinamica:
+                    ordem = OrdemDinamica(G, busca.estados, ordered_vertices, self.dominios, self.desempate)
+                bb_recursive(self, G, V, ordered_vertices, busca, 0, self.is_lower_bound, ordem)
+            elif self.motor == 'iterativo':
+                # Inicia a busca DFS (pilha explícita)
+                BuscaIterativa(self, G, ordered_vertices, busca, self.is_lower_bound).executar()
+            elif self.motor == 'melhor_primeiro':
+                # Inicia a busca pelo melhor limite (heap de nós abertos)
+                bb_melhor_primeiro(self, G, ordered_vertices, busca, self.is_lower_bound, self.max_nos_abertos)
+            else:
+                raise ValueError(f"Motor de busca desconhecido: {self.motor}")
+
+        self._finalizar_limites(G)
+        self.estatisticas['nos_expandidos'] = self.nos
+        if self.relaxacao is not None:
+            self.estatisticas['tempo_lp'] = self.relaxacao.tempo
+        self.estatisticas['tempo_total'] = time.perf_counter() - inicio
+
+        return self.melhores_estados, self.melhor_peso
+
+    def dominacao(self, tecnica: str, arquivo: str, pasta: str, atribuicao_gulosa: bool, pastaImagens: str):
+        """Gerencia o fluxo de execução de um arquivo, mede o tempo e registra o resultado em self.resultados."""
+        print("---------------------------------------------------------")
+        print(f"Iniciando processamento\n{tecnica}\nArquivo: {arquivo}")
+        print("---------------------------------------------------------")
+
+        is_lower_bound = self.is_lower_bound
+        is_upper_bound = self.is_upper_bound
+
+        # 1. Carregamento e Ordenação do Grafo
+        _, extensao = os.path.splitext(arquivo)
+        local_arquivo = pasta + arquivo
+
+        # Diferença para indicar se o índice do grafo começa em 0 ou 1: importar_grafo usa importar_base0
+        # para listas de arestas 0-based (como o grafo-40-1-0.3.txt) e converte os arquivos .mtx (1-based)
+        G, V, vertices_ordenados = self.carregar_grafo(local_arquivo)
+
+        # 2. PRÉ-PROCESSAMENTO: VERIFICAÇÃO DE VÉRTICES ISOLADOS
+        if vertices_isolados(G):
+            estados_peso_zero = [0] * V
+            # Levanta exceção, pois a DRT não é possível (Peso infinito)
+            adicionar_resultado(tecnica, is_lower_bound, is_upper_bound, arquivo, 0, 0, [],
+                                resultados=self.resultados, ordem_ramificacao=self.ordem_ramificacao)
+            if self.plotagem is not None:
+                self.plotagem(G, estados_peso_zero, 0, arquivo, tecnica, is_lower_bound, is_upper_bound, pastaImagens)
+            print("O grafo contém vértices isolados e não pode ser dominado")
+            return
+
+        if V == 0:
+            print("Erro: Grafo não carregado ou vazio.")
+            return
+
+        # 3. Execução e Medição de Tempo
+        start_time = time.perf_counter()
+
+        limite_inferior, gap, otimo_provado = None, None, False
+        if not atribuicao_gulosa:
+            melhores_estados, melhor_peso = self.resolver(G, vertices_ordenados)
+            limite_inferior, gap, otimo_provado = self.limite_inferior, self.gap, self.otimo_provado
+        else:
+            melhores_estados, melhor_peso = atribuicao_direta_gulosa(G, vertices_ordenados)
+
+        # 3. Continuação da Execução e Medição de Tempo
+        end_time = time.perf_counter()
+        tempo_total = end_time - start_time
+
+        if self.interrompido and not atribuicao_gulosa:
+            print(f"⏱️ Busca interrompida pelos limites ({self.nos} nós): lower bound provado {limite_inferior}, "
+                  f"gap {gap if gap is None else f'{gap:.2%}'}.")
+
+        # A validação final verifica o melhor estado encontrado.
+        #Desnecessário porque bb_recursive já realiza essa função.
+        #if not validar_solucao_final(G, melhores_estados):
+            # Se a solução for inválida, é um erro no B&B, e não deve prosseguir
+            #print("Erro: Grafo não carregado ou vazio.")
+            # return
+
+        # 4. Impressão do resultado
+        vertices_selecionados = impressao_resultado(melhores_estados, melhor_peso, tempo_total)
+
+        # 5. Adiciona o resultado para uma lista de exportação
+        adicionar_resultado(tecnica, is_lower_bound, is_upper_bound, arquivo, melhor_peso, round(tempo_total, 6),
+                            vertices_selecionados, resultados=self.resultados,
+                            ordem_ramificacao=self.ordem_ramificacao, limite_inferior=limite_inferior, gap=gap,
+                            otimo_provado=otimo_provado,
+                            estatisticas=None if atribuicao_gulosa else self.estatisticas)
+
+        # 6. Plotagem do Grafo
+        if self.plotagem is not None:
+            self.plotagem(G, melhores_estados, melhor_peso, arquivo, tecnica, is_lower_bound, is_upper_bound,
+                          pastaImagens)
+
+
+def branch_and_bound(G: Dict[int, Set[int]], ordered_vertices: List[int], is_lower_bound: bool, is_upper_bound: bool,
+                     motor: str = 'recursivo', representacao: str = 'conjuntos',
+                     max_nos_abertos: int = 100000, n_processos: Optional[int] = None,
+                     tempo_limite: Optional[float] = None, limite_nos: Optional[int] = None,
+                     reduzir: bool = False, decompor: bool = False, ordem_dinamica: bool = False,
+                     intervalo_lp: Optional[int] = None, tempo_busca_local: Optional[float] = None,
+                     inicios_grasp: Optional[int] = None) -> \
+Tuple[
+    Optional[List[int]], Optional[int]]:
+    """
+    Função wrapper para inicializar o Branch and Bound (B&B) com um Solver novo.
+    O Grafo (G) e os Vértices Ordenados são 0-based. Ver Solver para os parâmetros.
 
-    if not atribuicao_gulosa:
-        #return BEST_STATES, BEST_WEIGHT
-        melhores_estados, melhor_peso = branch_and_bound(G, vertices_ordenados, is_lower_bound, is_upper_bound)
+    Returns:
+        Tuple[Optional[List[int]], Optional[int]]: O melhor estado e o melhor peso encontrados.
+    """
+    solver = Solver(is_lower_bound=is_lower_bound, is_upper_bound=is_upper_bound, motor=motor,
+                    representacao=representacao, max_nos_abertos=max_nos_abertos, n_processos=n_processos,
+                    tempo_limite=tempo_limite, limite_nos=limite_nos, reduzir=reduzir, decompor=decompor,
+                    ordem_dinamica=ordem_dinamica, intervalo_lp=intervalo_lp,
+                    tempo_busca_local=tempo_busca_local, inicios_grasp=inicios_grasp)
+    return solver.resolver(G, ordered_vertices)
+
+
+def dominacao(tecnica: str, arquivo: str, pasta: str, is_lower_bound: bool, is_upper_bound: bool, atribuicao_gulosa: bool, pastaImagens: str,
+              tempo_limite: Optional[float] = None, limite_nos: Optional[int] = None, cronometrar: bool = False,
+              motor: str = 'recursivo', plotagem: Optional[Callable] = plotar_grafico):
+    """
+    Função principal que gerencia o fluxo de execução, mede o tempo e apresenta os resultados (em RESULTADOS).
+    tempo_limite e limite_nos interrompem o B&B mantendo o incumbente; cronometrar mede o tempo em
+    lower_bound e na verificação de viabilidade; motor escolhe o método exato ('milp' para o HiGHS,
+    ver Solver); plotagem gera a imagem (FilaPlotagem.enviar para segundo plano, None para nenhuma).
+    """
+    solver = Solver(is_lower_bound=is_lower_bound, is_upper_bound=is_upper_bound, motor=motor,
+                    tempo_limite=tempo_limite, limite_nos=limite_nos, cronometrar=cronometrar, resultados=RESULTADOS,
+                    plotagem=plotagem)
+    solver.dominacao(tecnica, arquivo, pasta, atribuicao_gulosa, pastaImagens)
+
+# ======================================================================
+# EXECUÇÃO EM LOTE (PARALELA)
+# ======================================================================
+
+# Configurações de dominacao executadas para cada grafo: (técnica, lower bound, upper bound, gulosa, motor)
+CONFIGURACOES_DOMINACAO: List[Tuple[str, bool, bool, bool, str]] = [
+    ('Atribuição direta gulosa', False, False, True, 'recursivo'),
+    ('B&B - upper bound', False, True, False, 'recursivo'),
+    ('B&B - lower and upper bound', True, True, False, 'recursivo'),
+    ('B&B - lower bound', True, False, False, 'recursivo'),
+    ('B&B', False, False, False, 'recursivo'),
+    ('MILP (HiGHS)', False, True, False, 'milp'),
+]
+
+
+# Modos de geração das imagens em executar_lote
+MODOS_PLOTAGEM = ('fundo', 'sincrona', 'nenhuma')
+
+
+def _executar_tarefa(conexao, tecnica: str, grafo: str, pasta: str, is_lower_bound: bool,
+                     is_upper_bound: bool, atribuicao_gulosa: bool, motor: str, pastaImagens: str,
+                     tempo_limite_busca: Optional[float], cronometrar: bool, plotagem: str):
+    """
+    Processo filho de executar_lote: roda uma configuração de dominacao e devolve os registros.
+
+    Tudo o que a tarefa envia ao processo principal segue pela sua própria conexão (Pipe):
+    ('imagem', argumentos de plotar_grafico) no modo 'fundo', para a FilaPlotagem do processo
+    principal, e ('resultado', registros) ao final. Como a conexão não é compartilhada, encerrar
+    a tarefa por tempo esgotado não afeta as demais.
+    """
+    if plotagem == 'fundo':
+        funcao_plotagem = lambda *argumentos: conexao.send(('imagem', argumentos))
     else:
-        #return current_weight, estados_guloso
-        melhores_estados, melhor_peso = atribuicao_direta_gulosa(G, vertices_ordenados)
+        funcao_plotagem = plotar_grafico if plotagem == 'sincrona' else None
+
+    solver = Solver(is_lower_bound=is_lower_bound, is_upper_bound=is_upper_bound, motor=motor,
+                    tempo_limite=tempo_limite_busca, cronometrar=cronometrar, plotagem=funcao_plotagem)
+    solver.dominacao(tecnica, grafo, pasta, atribuicao_gulosa, pastaImagens)
+    conexao.send(('resultado', solver.resultados))
+    conexao.close()
+
 
-    # 3. Continuação da Execução e Medição de Tempo
-    end_time = time.perf_counter()
-    tempo_total = end_time - start_time
+def executar_lote(arquivos: List[str], pasta: str, pastaImagens: str,
+                  configuracoes: List[Tuple[str, bool, bool, bool, str]] = CONFIGURACOES_DOMINACAO,
+                  n_processos: Optional[int] = None, tempo_limite: Optional[float] = None,
+                  tempo_limite_busca: Optional[float] = None, cronometrar: bool = False,
+                  resultados: Optional[List[Tuple]] = None, plotagem: str = 'fundo',
+                  n_processos_plotagem: int = 1, ao_concluir_grafo: Optional[Callable[[], None]] = None):
+    """
+    Executa todas as combinações (grafo, configuração) em processos paralelos.
 
-    # A validação final verifica o melhor estado encontrado.
-    #Desnecessário porque bb_recursive já realiza essa função.
-    #if not validar_solucao_final(G, melhores_estados):
-        # Se a solução for inválida, é um erro no B&B, e não deve prosseguir
-        #print("Erro: Grafo não carregado ou vazio.")
-        # return
+    Cada tarefa roda dominacao em um processo próprio; no máximo n_processos tarefas rodam ao
+    mesmo tempo. Uma tarefa que passa de tempo_limite segundos é encerrada e registrada com peso
+    None; cada tarefa se comunica por um Pipe próprio, então encerrá-la não corrompe a comunicação
+    das demais. Os registros de cada tarefa são devolvidos ao processo principal e acrescentados a
+    'resultados' (padrão: lista global RESULTADOS) na ordem (grafo, configuração), como na execução serial,
+    assim que as tarefas anteriores também terminaram.
 
-    # 4. Impressão do resultado
-    vertices_selecionados = impressao_resultado(melhores_estados, melhor_peso, tempo_total)
+    Se a execução é interrompida (ex.: Ctrl-C) ou falha, as tarefas em andamento são encerradas, os
+    registros já recebidos são acrescentados a 'resultados' e a exceção é propagada.
 
-    # 5. Adiciona o resultado para uma lista de exportação
-    adicionar_resultado(tecnica, is_lower_bound, is_upper_bound, arquivo, melhor_peso, round(tempo_total, 6),
-                        vertices_selecionados)
+    Args:
+        arquivos: Nomes dos arquivos de grafo dentro de 'pasta'.
+        configuracoes: Lista de (técnica, lower bound, upper bound, gulosa, motor do Solver).
+        n_processos: Número máximo de tarefas simultâneas (padrão: os.cpu_count()).
+        tempo_limite: Tempo máximo por tarefa, em segundos (None = sem limite).
+        tempo_limite_busca: Tempo máximo do B&B de cada tarefa (Solver.tempo_limite). Ao contrário
+                            de tempo_limite, a busca para normalmente e registra o incumbente, o
+                            lower bound provado e o gap.
+        cronometrar: Registra o tempo gasto em lower_bound e na verificação de viabilidade.
+        plotagem: 'fundo' (imagens geradas por uma FilaPlotagem do processo principal, sem atrasar
+                  as tarefas), 'sincrona' (cada tarefa gera a sua imagem antes de terminar) ou
+                  'nenhuma' (sem imagens, para medir a vazão).
+        n_processos_plotagem: Processos da FilaPlotagem no modo 'fundo'.
+        ao_concluir_grafo: Chamada sem argumentos sempre que os registros de todas as configurações de
+                           um grafo são acrescentados a 'resultados' (ex.: para regravar a planilha).
+    """
+    if plotagem not in MODOS_PLOTAGEM:
+        raise ValueError(f"Modo de plotagem desconhecido: {plotagem}")
+    if resultados is None:
+        resultados = RESULTADOS
+
+    n_processos = n_processos or os.cpu_count() or 1
+    tarefas = [(grafo, configuracao) for grafo in arquivos for configuracao in configuracoes]
+    pendentes = list(range(len(tarefas)))
+    pendentes.reverse()
+    ativos = {}  # indice -> (processo, conexão de leitura, instante de início)
+    registros = {}
+
+    imagens = FilaPlotagem(n_processos_plotagem) if plotagem == 'fundo' else None
+
+    def ler(indice: int, conexao):
+        # Lê as mensagens disponíveis da tarefa (as imagens pedidas precisam ser lidas para a tarefa terminar)
+        try:
+            while conexao.poll():
+                tipo, dados = conexao.recv()
+                if tipo == 'imagem':
+                    imagens.enviar(*dados)
+                else:
+                    registros[indice] = dados
+        except (EOFError, OSError):
+            pass  # A tarefa terminou (ou foi encerrada) e a conexão foi fechada
+
+    def receber(espera: float):
+        conexoes = {conexao: indice for indice, (_, conexao, _) in ativos.items()}
+        for conexao in multiprocessing.connection.wait(list(conexoes), timeout=espera):
+            ler(conexoes[conexao], conexao)
+
+    n_configuracoes = len(configuracoes)
+    proximo = 0  # Primeira tarefa cujos registros ainda não foram acrescentados a 'resultados'
+
+    def acrescentar_concluidas():
+        nonlocal proximo
+        while proximo in registros and proximo not in ativos:
+            resultados.extend(registros.pop(proximo))
+            proximo += 1
+            if proximo % n_configuracoes == 0 and ao_concluir_grafo is not None:
+                ao_concluir_grafo()
+
+    try:
+        while pendentes or ativos:
+            # 1. Inicia novas tarefas até ocupar todos os processos
+            while pendentes and len(ativos) < n_processos:
+                indice = pendentes.pop()
+                grafo, (tecnica, is_lower_bound, is_upper_bound, atribuicao_gulosa, motor) = tarefas[indice]
+                leitura, escrita = multiprocessing.Pipe(duplex=False)
+                processo = multiprocessing.Process(
+                    target=_executar_tarefa,
+                    args=(escrita, tecnica, grafo, pasta, is_lower_bound, is_upper_bound, atribuicao_gulosa,
+                          motor, pastaImagens, tempo_limite_busca, cronometrar, plotagem))
+                processo.start()
+                # O processo principal só lê: fechar a sua cópia da escrita permite detectar o fim da tarefa
+                escrita.close()
+                ativos[indice] = (processo, leitura, time.perf_counter())
+
+            # 2. Recebe os resultados disponíveis
+            receber(0.1)
+
+            # 3. Finaliza tarefas concluídas, com erro ou com tempo esgotado
+            for indice, (processo, leitura, inicio) in list(ativos.items()):
+                grafo, (tecnica, is_lower_bound, is_upper_bound, _, _) = tarefas[indice]
+
+                if not processo.is_alive():
+                    ler(indice, leitura)  # O resultado pode ter chegado depois da última leitura
+                    processo.join()
+                    leitura.close()
+                    if indice not in registros:
+                        print(f"❌ A tarefa '{tecnica}' do grafo {grafo} terminou sem resultado "
+                              f"(código de saída {processo.exitcode}).")
+                        registros[indice] = []
+                        adicionar_resultado(tecnica, is_lower_bound, is_upper_bound, grafo, None, None, [],
+                                            resultados=registros[indice])
+                    del ativos[indice]
+
+                elif tempo_limite is not None and time.perf_counter() - inicio > tempo_limite:
+                    # Só a conexão desta tarefa pode ficar incompleta, e ela é descartada
+                    processo.terminate()
+                    processo.join()
+                    leitura.close()
+                    print(f"⏱️ Tempo limite de {tempo_limite} s atingido: '{tecnica}' no grafo {grafo}.")
+                    registros[indice] = []
+                    adicionar_resultado(tecnica, is_lower_bound, is_upper_bound, grafo, None, tempo_limite, [],
+                                        resultados=registros[indice])
+                    del ativos[indice]
+
+            # 4. Acrescenta a 'resultados', na ordem das tarefas, os registros já completos
+            acrescentar_concluidas()
+    except BaseException:
+        # Execução interrompida: encerra as tarefas e as imagens em andamento e mantém o que já foi recebido
+        for processo, leitura, _ in ativos.values():
+            processo.terminate()
+            processo.join()
+            leitura.close()
+        if imagens is not None:
+            imagens.cancelar()
+        for indice in sorted(registros):
+            resultados.extend(registros[indice])
+        raise
+
+    if imagens is not None:
+        imagens.aguardar()
 
-    # 6. Plotagem do Grafo
-    plotar_grafico(G, melhores_estados, melhor_peso, arquivo, tecnica, is_lower_bound, is_upper_bound, pastaImagens)
 
 # ======================================================================
 # EXECUÇÃO DO SCRIPT
@@ -1053,25 +4374,41 @@ def dominacao(tecnica: str, arquivo: str, pasta: str, is_lower_bound: bool, is_u
 
 """
     Observar a ordem da variável BRANCHING_ORDER
+
+    O script (main) só executa quando bb.py é o programa principal: os processos trabalhadores do
+    B&B paralelo importam este módulo (no Windows, via 'spawn') e não devem repetir a varredura.
 """
-pasta = "grafos\\"
-pastaImagens = "imagens"
-arquivo = "resultado.xls"
-planilha = "Resultado"
-
-# Recuperação da lista de arquivos
-arquivos_encontrados = recuperar_lista_arquivos(pasta)
-if arquivos_encontrados:
-    print(f"✅ Arquivos encontrados na pasta {pasta}:")
-    # for arquivo in arquivos_encontrados:
-    #    print(f"{arquivo}")
-else:
-    print("❌ Não foram encontrados arquivos, ou a pasta não existe.")
-
-for grafo in arquivos_encontrados:
-    dominacao('Atribuição direta gulosa', grafo, pasta, False, False, True, pastaImagens)
-    dominacao('B&B - upper bound', grafo, pasta, False, True, False, pastaImagens)
-    dominacao('B&B - lower and upper bound', grafo, pasta, True, True, False, pastaImagens)
-    dominacao('B&B - lower bound', grafo, pasta, True, False, False, pastaImagens)
-    dominacao('B&B', grafo, pasta, False, False, False, pastaImagens)
-    exportar_excel(arquivo, planilha)
+def main():
+    pasta = "grafos\\"
+    pastaImagens = "imagens"
+    arquivo = "resultado.xls"
+    planilha = "Resultado"
+    tempo_limite_tarefa = 3600  # Segundos por (grafo, técnica) na execução em lote
+    tempo_limite_busca = 3000  # B&B interrompido com o incumbente (lower bound e gap registrados)
+    plotagem = 'fundo'  # 'fundo', 'sincrona' ou 'nenhuma' (sem imagens, para medir a vazão)
+    # Tempo em lower_bound e na verificação de viabilidade nas colunas da planilha (gargalo por família);
+    # a medição custa tempo por nó: False para medir apenas o tempo total das técnicas
+    cronometrar = True
+
+    # Recuperação da lista de arquivos
+    arquivos_encontrados = recuperar_lista_arquivos(pasta)
+    if arquivos_encontrados:
+        print(f"✅ Arquivos encontrados na pasta {pasta}:")
+        # for arquivo in arquivos_encontrados:
+        #    print(f"{arquivo}")
+    else:
+        print("❌ Não foram encontrados arquivos, ou a pasta não existe.")
+
+    # Execução em lote: todas as combinações (grafo, técnica) em paralelo.
+    # A planilha é regravada a cada grafo concluído e, se a execução for interrompida, com o que já foi coletado.
+    try:
+        executar_lote(arquivos_encontrados, pasta, pastaImagens, tempo_limite=tempo_limite_tarefa,
+                      tempo_limite_busca=tempo_limite_busca, cronometrar=cronometrar, plotagem=plotagem,
+                      ao_concluir_grafo=lambda: exportar_excel(arquivo, planilha))
+    except BaseException:
+        exportar_excel(arquivo, planilha)
+        raise
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+"""
+Benchmark reprodutível do Branch and Bound sobre as famílias de grafos de grafos/.
+
+Cada família é identificada por "N-p" (ex.: 50-0.5 agrupa grafo-50-0-0.5.txt ... grafo-50-9-0.5.txt).
+Para cada configuração do Solver e cada família, todas as instâncias escolhidas são resolvidas
+'repeticoes' vezes; o resultado guarda mediana e IQR do tempo total e dos nós expandidos de
+cada repetição, além das informações da máquina e da revisão do git.
+
+Exemplos:
+    python benchmark.py --familias 20-0.4 30-0.5 --repeticoes 5 --salvar base.json
+    python benchmark.py --familias 90-0.9 --configuracoes lb_ub lb_ub_bits --tempo-limite 60
+    python benchmark.py --familias 20-0.4 30-0.5 --comparar base.json --limite-regressao 0.10
+
+Com --comparar, o comando termina com código 1 se alguma mediana (tempo ou nós) piorar mais
+que --limite-regressao (fração) em relação ao arquivo de referência.
+
+Com --orcamento-importacao, o tempo de 'import bb' em um interpretador novo é medido antes do
+benchmark, e o comando termina com código 1 se passar do orçamento (em segundos) ou se a
+importação carregar alguma biblioteca de MODULOS_PESADOS:
+    python benchmark.py --orcamento-importacao 0.5 --familias 20-0.4 --repeticoes 1
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import bb
+
+# Configurações do Solver disponíveis no benchmark: nome -> argumentos de bb.Solver
+CONFIGURACOES_BENCHMARK: Dict[str, Dict] = {
+    'ub': dict(is_lower_bound=False, is_upper_bound=True),
+    'lb_ub': dict(is_lower_bound=True, is_upper_bound=True),
+    'lb_ub_bits': dict(is_lower_bound=True, is_upper_bound=True, representacao='bits'),
+    'lb_ub_reduzido': dict(is_lower_bound=True, is_upper_bound=True, representacao='bits', reduzir=True),
+    'lb_ub_componentes': dict(is_lower_bound=True, is_upper_bound=True, representacao='bits', decompor=True),
+    'lb_ub_dinamico': dict(is_lower_bound=True, is_upper_bound=True, representacao='bits', ordem_dinamica=True),
+    'ub_lp': dict(is_upper_bound=True, representacao='bits', intervalo_lp=1),
+    'milp': dict(motor='milp'),
+    'lb_ub_busca_local': dict(is_lower_bound=True, is_upper_bound=True, representacao='bits', tempo_busca_local=1.0),
+    'lb_ub_grasp': dict(is_lower_bound=True, is_upper_bound=True, representacao='bits', inicios_grasp=32),
+    'lb_ub_iterativo': dict(is_lower_bound=True, is_upper_bound=True, motor='iterativo', representacao='bits'),
+    'melhor_primeiro': dict(is_lower_bound=True, is_upper_bound=True, motor='melhor_primeiro', representacao='bits'),
+    'paralelo': dict(is_lower_bound=True, is_upper_bound=True, motor='paralelo', representacao='bits'),
+}
+
+PADRAO_ARQUIVO = re.compile(r'grafo-(\d+)-(\d+)-([\d.]+)\.txt$')
+
+# Bibliotecas que 'import bb' não deve carregar (bb as importa na primeira chamada das funções que as usam)
+MODULOS_PESADOS = ('matplotlib', 'networkx', 'pandas', 'scipy')
+
+# Executado em um interpretador novo: mede 'import bb' e lista os módulos de MODULOS_PESADOS carregados
+CODIGO_IMPORTACAO = (
+    "import json, sys, time\n"
+    "inicio = time.perf_counter()\n"
+    "import bb\n"
+    "tempo = time.perf_counter() - inicio\n"
+    "carregados = sorted({nome.split('.')[0] for nome in sys.modules} & set(sys.argv[1:]))\n"
+    "print(json.dumps([tempo, carregados]))\n"
+)
+
+
+# ======================================================================
+# INSTÂNCIAS E AMBIENTE
+# ======================================================================
+
+def listar_familias(pasta: str) -> Dict[str, List[str]]:
+    """
+    Agrupa os arquivos grafo-N-i-p.txt da pasta por família "N-p".
+
+    Returns:
+        Dict[str, List[str]]: Família -> arquivos, ordenados pelo índice i.
+    """
+    familias: Dict[str, List[Tuple[int, str]]] = {}
+    for arquivo in bb.recuperar_lista_arquivos(pasta):
+        correspondencia = PADRAO_ARQUIVO.match(arquivo)
+        if correspondencia:
+            n, indice, p = correspondencia.groups()
+            familias.setdefault(f"{n}-{p}", []).append((int(indice), arquivo))
+
+    return {familia: [arquivo for _, arquivo in sorted(itens)] for familia, itens in sorted(familias.items())}
+
+
+def informacoes_maquina() -> Dict:
+    """Sistema, processador e versões usados na execução."""
+    return {
+        'sistema': platform.platform(),
+        'processador': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+    }
+
+
+def revisao_git() -> Optional[str]:
+    """Commit atual (com sufixo '-modificado' se bb.py tem alterações não commitadas), ou None fora do git."""
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    try:
+        revisao = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=pasta, capture_output=True, text=True,
+                                 check=True).stdout.strip()
+        alteracoes = subprocess.run(['git', 'status', '--porcelain', 'bb.py', 'benchmark.py'], cwd=pasta,
+                                    capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return revisao + ('-modificado' if alteracoes else '')
+
+
+def tempo_importacao(repeticoes: int = 5) -> Tuple[float, List[str]]:
+    """
+    Tempo de 'import bb' em interpretadores novos (mediana de 'repeticoes' processos), que é o custo
+    pago por cada processo trabalhador ou chamada de linha de comando.
+
+    Returns:
+        Tuple[float, List[str]]: Mediana do tempo (s) e bibliotecas de MODULOS_PESADOS carregadas pelo import.
+    """
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    tempos, carregados = [], set()
+    for _ in range(repeticoes):
+        saida = subprocess.run([sys.executable, '-c', CODIGO_IMPORTACAO, *MODULOS_PESADOS], cwd=pasta,
+                               capture_output=True, text=True, check=True).stdout
+        tempo, modulos = json.loads(saida.splitlines()[-1])
+        tempos.append(tempo)
+        carregados.update(modulos)
+
+    return statistics.median(tempos), sorted(carregados)
+
+
+def verificar_importacao(orcamento: float, repeticoes: int = 5) -> List[str]:
+    """
+    Confere tempo_importacao contra o orçamento (s).
+
+    Returns:
+        List[str]: Descrição de cada violação (vazia se o import está dentro do orçamento).
+    """
+    tempo, carregados = tempo_importacao(repeticoes)
+    print(f"{'import bb':>16}  tempo {tempo:10.4f} s (orçamento {orcamento:.4f} s)"
+          + (f"  carrega {', '.join(carregados)}" if carregados else ""))
+
+    violacoes = []
+    if tempo > orcamento:
+        violacoes.append(f"import bb: {tempo:.4f} s > {orcamento:.4f} s")
+    if carregados:
+        violacoes.append(f"import bb carrega {', '.join(carregados)}")
+    return violacoes
+
+
+# ======================================================================
+# EXECUÇÃO
+# ======================================================================
+
+def resumo(valores: List[float]) -> Dict[str, float]:
+    """Mediana e intervalo interquartil (IQR) de uma amostra."""
+    if len(valores) < 2:
+        return {'mediana': valores[0], 'iqr': 0.0}
+
+    q1, _, q3 = statistics.quantiles(valores, n=4, method='inclusive')
+    return {'mediana': statistics.median(valores), 'iqr': q3 - q1}
+
+
+def executar_benchmark(pasta: str, familias: List[str], configuracoes: List[str], repeticoes: int,
+                       instancias: Optional[int], tempo_limite: Optional[float]) -> Dict:
+    """
+    Executa o benchmark e devolve o relatório (serializável em JSON).
+
+    Em cada repetição, o tempo e os nós de uma família são a soma sobre as suas instâncias;
+    mediana e IQR são calculados sobre as repetições.
+    """
+    disponiveis = listar_familias(pasta)
+    relatorio = {
+        'data': datetime.datetime.now().isoformat(timespec='seconds'),
+        'maquina': informacoes_maquina(),
+        'revisao': revisao_git(),
+        'parametros': {'repeticoes': repeticoes, 'instancias': instancias, 'tempo_limite': tempo_limite},
+        'resultados': {},
+    }
+
+    for familia in familias:
+        if familia not in disponiveis:
+            raise ValueError(f"Família '{familia}' não encontrada em {pasta} (disponíveis: {', '.join(disponiveis)})")
+
+        arquivos = disponiveis[familia][:instancias]
+        grafos = [bb.importar_base0(os.path.join(pasta, arquivo)) for arquivo in arquivos]
+
+        for nome in configuracoes:
+            tempos, nos, interrompidas = [], [], 0
+            pesos: Dict[str, float] = {}
+
+            for _ in range(repeticoes):
+                tempo_total, nos_total = 0.0, 0
+                for arquivo, (G, V, vertices_ordenados) in zip(arquivos, grafos):
+                    solver = bb.Solver(tempo_limite=tempo_limite, **CONFIGURACOES_BENCHMARK[nome])
+                    inicio = time.perf_counter()
+                    solver.resolver(G, vertices_ordenados)
+                    tempo_total += time.perf_counter() - inicio
+                    nos_total += solver.estatisticas['nos_expandidos']
+                    interrompidas += solver.interrompido
+                    pesos[arquivo] = solver.melhor_peso
+
+                tempos.append(tempo_total)
+                nos.append(nos_total)
+
+            relatorio['resultados'].setdefault(nome, {})[familia] = {
+                'instancias': len(arquivos),
+                'tempo': resumo(tempos),
+                'nos': resumo(nos),
+                'interrompidas': interrompidas,
+                'pesos': pesos,
+            }
+            print(f"{nome:>16} {familia:>7}  tempo {statistics.median(tempos):10.4f} s "
+                  f"(IQR {relatorio['resultados'][nome][familia]['tempo']['iqr']:.4f})  "
+                  f"nós {statistics.median(nos):12.0f}"
+                  + (f"  [{interrompidas} interrompidas]" if interrompidas else ""))
+
+    return relatorio
+
+
+def comparar(relatorio: Dict, referencia: Dict, limite_regressao: float) -> List[str]:
+    """
+    Compara as medianas do relatório com as de referência.
+
+    Returns:
+        List[str]: Descrição de cada regressão acima de limite_regressao (vazia se não houve).
+    """
+    regressoes = []
+
+    for nome, familias in relatorio['resultados'].items():
+        for familia, atual in familias.items():
+            anterior = referencia.get('resultados', {}).get(nome, {}).get(familia)
+            if anterior is None:
+                continue
+            if anterior['instancias'] != atual['instancias']:
+                print(f"{nome:>16} {familia:>7}  ignorada: {atual['instancias']} instâncias "
+                      f"(referência com {anterior['instancias']})")
+                continue
+
+            for metrica in ('tempo', 'nos'):
+                antes = anterior[metrica]['mediana']
+                depois = atual[metrica]['mediana']
+                variacao = (depois - antes) / antes if antes > 0 else 0.0
+                print(f"{nome:>16} {familia:>7}  {metrica:>5}: {antes:.4f} -> {depois:.4f} ({variacao:+.1%})")
+                if variacao > limite_regressao:
+                    regressoes.append(f"{nome} {familia} {metrica}: {variacao:+.1%}")
+
+            if anterior.get('pesos') and anterior['pesos'] != atual['pesos'] and not atual['interrompidas']:
+                regressoes.append(f"{nome} {familia}: pesos diferentes da referência")
+
+    return regressoes
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do Branch and Bound sobre as famílias de grafos/.")
+    parser.add_argument('--pasta', default='grafos', help="Pasta com os arquivos grafo-N-i-p.txt.")
+    parser.add_argument('--familias', nargs='+', default=['20-0.4', '30-0.5'],
+                        help="Famílias N-p a executar (ex.: 20-0.4 50-0.5 90-0.9).")
+    parser.add_argument('--configuracoes', nargs='+', default=['lb_ub', 'lb_ub_bits'],
+                        choices=sorted(CONFIGURACOES_BENCHMARK), help="Configurações do Solver.")
+    parser.add_argument('--repeticoes', type=int, default=5, help="Repetições de cada (configuração, família).")
+    parser.add_argument('--instancias', type=int, default=None, help="Máximo de instâncias por família.")
+    parser.add_argument('--tempo-limite', type=float, default=None, help="Tempo máximo de cada resolução (s).")
+    parser.add_argument('--salvar', help="Arquivo JSON onde gravar o relatório.")
+    parser.add_argument('--comparar', help="Relatório JSON de referência.")
+    parser.add_argument('--limite-regressao', type=float, default=0.10,
+                        help="Piora relativa máxima aceita nas medianas (padrão: 0.10).")
+    parser.add_argument('--orcamento-importacao', type=float, default=None,
+                        help="Tempo máximo (s) de 'import bb' em um interpretador novo, conferido antes do benchmark.")
+    args = parser.parse_args(argumentos)
+
+    if args.orcamento_importacao is not None:
+        violacoes = verificar_importacao(args.orcamento_importacao)
+        if violacoes:
+            print("❌ Importação acima do orçamento:")
+            for violacao in violacoes:
+                print(f"   {violacao}")
+            return 1
+        print("✅ Importação dentro do orçamento.")
+
+    relatorio = executar_benchmark(args.pasta, args.familias, args.configuracoes, args.repeticoes,
+                                   args.instancias, args.tempo_limite)
+
+    if args.salvar:
+        with open(args.salvar, 'w', encoding='utf-8') as arquivo:
+            json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+        print(f"Relatório gravado em {args.salvar}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            referencia = json.load(arquivo)
+        regressoes = comparar(relatorio, referencia, args.limite_regressao)
+        if regressoes:
+            print("❌ Regressões acima de {:.0%}:".format(args.limite_regressao))
+            for regressao in regressoes:
+                print(f"   {regressao}")
+            return 1
+        print("✅ Nenhuma regressão acima do limite.")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
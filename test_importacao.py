@@ -0,0 +1,29 @@
+"""
+Testes do custo de 'import bb' (mesma medição de benchmark.py --orcamento-importacao).
+
+Executar com:
+    python -m pytest -q test_importacao.py
+"""
+import unittest
+
+from benchmark import MODULOS_PESADOS, tempo_importacao
+
+# Orçamento do tempo de 'import bb' em um interpretador novo, em segundos (numpy incluso)
+ORCAMENTO_IMPORTACAO = 0.5
+
+
+class TesteImportacao(unittest.TestCase):
+
+    def test_import_nao_carrega_modulos_pesados(self):
+        _, carregados = tempo_importacao(repeticoes=1)
+        self.assertEqual(carregados, [], f"import bb carrega {', '.join(carregados)} (MODULOS_PESADOS: "
+                                         f"{', '.join(MODULOS_PESADOS)})")
+
+    def test_import_dentro_do_orcamento(self):
+        tempo, _ = tempo_importacao(repeticoes=3)
+        self.assertLessEqual(tempo, ORCAMENTO_IMPORTACAO,
+                             f"import bb: {tempo:.4f} s > {ORCAMENTO_IMPORTACAO:.4f} s")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+Testes de otimalidade: compara as configurações do Solver com a força bruta em grafos pequenos
+(aleatórios, árvores e desconexos).
+
+Executar com:
+    python -m pytest -q test_otimalidade.py
+"""
+import itertools
+import random
+import unittest
+from typing import Dict, List, Optional, Set
+
+import bb
+
+# Árvore em que o lower bound heurístico poda o ótimo (ótimo 7, ordem de ramificação dada)
+ARVORE_PODA_HEURISTICA = {0: {1, 5}, 1: {0, 2, 3}, 2: {1, 6}, 3: {1, 4, 8}, 4: {3}, 5: {0, 7}, 6: {2, 7},
+                          7: {5, 6}, 8: {3}}
+ORDEM_PODA_HEURISTICA = [1, 3, 0, 2, 5, 6, 7, 4, 8]
+
+# Configurações do Solver (além de is_lower_bound / is_upper_bound) comparadas com a força bruta
+CONFIGURACOES = [
+    dict(motor='recursivo'),
+    dict(motor='iterativo'),
+    dict(representacao='bits'),
+    dict(motor='iterativo', representacao='bits'),
+    dict(motor='melhor_primeiro'),
+    dict(motor='melhor_primeiro', max_nos_abertos=4),
+    dict(motor='paralelo', n_processos=2),
+    dict(reduzir=True),
+    dict(decompor=True),
+    dict(ordem_dinamica=True),
+    dict(intervalo_lp=2),
+    dict(motor='iterativo', intervalo_lp=1),
+    dict(motor='melhor_primeiro', intervalo_lp=1),
+    dict(motor='milp'),
+    dict(tempo_busca_local=0.01),
+    dict(inicios_grasp=4, n_processos=1),
+]
+
+# Limites de nós das buscas interrompidas
+LIMITES_NOS = [1, 5, 20]
+
+
+def solucao_valida(G: Dict[int, Set[int]], estados: List[int]) -> bool:
+    """Definição da DRT: 0 exige vizinho com 2, e todo vértice com peso >= 1 tem vizinho com peso >= 1."""
+    for v, vizinhos in G.items():
+        if estados[v] == 0 and not any(estados[w] == 2 for w in vizinhos):
+            return False
+        if estados[v] >= 1 and not any(estados[w] >= 1 for w in vizinhos):
+            return False
+    return True
+
+
+def otimo_forca_bruta(G: Dict[int, Set[int]]) -> int:
+    """Menor peso entre todas as 3^V atribuições válidas."""
+    return min(sum(estados) for estados in itertools.product((0, 1, 2), repeat=len(G))
+               if solucao_valida(G, list(estados)))
+
+
+def grafo_aleatorio(rng: random.Random, V: int, p: float) -> Dict[int, Set[int]]:
+    """G(V, p) sem vértices isolados (cada vértice isolado ganha uma aresta aleatória)."""
+    G = {v: set() for v in range(V)}
+    for u, w in itertools.combinations(range(V), 2):
+        if rng.random() < p:
+            G[u].add(w)
+            G[w].add(u)
+    for v in range(V):
+        if not G[v]:
+            w = rng.choice([x for x in range(V) if x != v])
+            G[v].add(w)
+            G[w].add(v)
+    return G
+
+
+def arvore_aleatoria(rng: random.Random, V: int) -> Dict[int, Set[int]]:
+    """Árvore aleatória (cada vértice se liga a um vértice anterior)."""
+    G = {v: set() for v in range(V)}
+    for v in range(1, V):
+        w = rng.randrange(v)
+        G[v].add(w)
+        G[w].add(v)
+    return G
+
+
+def ordem_por_grau(G: Dict[int, Set[int]]) -> List[int]:
+    return sorted(G, key=lambda v: len(G[v]), reverse=True)
+
+
+def instancias() -> List[tuple]:
+    """(nome, G, ordered_vertices) dos grafos testados."""
+    rng = random.Random(2024)
+    casos = [('arvore_poda_heuristica', ARVORE_PODA_HEURISTICA, ORDEM_PODA_HEURISTICA)]
+    for i in range(4):
+        G = grafo_aleatorio(rng, rng.randint(5, 9), rng.choice((0.25, 0.4, 0.6)))
+        casos.append((f'aleatorio_{i}', G, ordem_por_grau(G)))
+    for i in range(4):
+        G = arvore_aleatoria(rng, rng.randint(5, 9))
+        casos.append((f'arvore_{i}', G, ordem_por_grau(G)))
+    # Duas componentes: caminho P4 e ciclo C5
+    G = {0: {1}, 1: {0, 2}, 2: {1, 3}, 3: {2}, 4: {5, 8}, 5: {4, 6}, 6: {5, 7}, 7: {6, 8}, 8: {7, 4}}
+    casos.append(('desconexo', G, ordem_por_grau(G)))
+    return casos
+
+
+class TesteOtimalidade(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.casos = [(nome, G, ordem, otimo_forca_bruta(G)) for nome, G, ordem in instancias()]
+
+    def verificar(self, solver: bb.Solver, G: Dict[int, Set[int]], otimo: int, completo: bool = True):
+        estados: Optional[List[int]] = solver.melhores_estados
+        if estados is not None:
+            self.assertTrue(solucao_valida(G, estados))
+            self.assertEqual(sum(estados), solver.melhor_peso)
+            self.assertGreaterEqual(solver.melhor_peso, otimo)
+
+        # Nenhuma configuração pode certificar um resultado subótimo nem um limite acima do ótimo
+        if solver.limite_inferior is not None:
+            self.assertLessEqual(solver.limite_inferior, otimo)
+        if solver.otimo_provado:
+            self.assertEqual(solver.melhor_peso, otimo)
+
+        # Sem o lower bound heurístico, a busca completa é exata
+        if completo and not solver.is_lower_bound:
+            self.assertEqual(solver.melhor_peso, otimo)
+            self.assertTrue(solver.otimo_provado)
+
+    def test_busca_completa(self):
+        for nome, G, ordem, otimo in self.casos:
+            for configuracao in CONFIGURACOES:
+                for is_lower_bound, is_upper_bound in itertools.product((False, True), repeat=2):
+                    with self.subTest(grafo=nome, lb=is_lower_bound, ub=is_upper_bound, **configuracao):
+                        solver = bb.Solver(is_lower_bound=is_lower_bound, is_upper_bound=is_upper_bound,
+                                           plotagem=None, **configuracao)
+                        solver.resolver(G, list(ordem))
+                        self.assertFalse(solver.interrompido)
+                        self.verificar(solver, G, otimo)
+
+    def test_busca_interrompida(self):
+        for nome, G, ordem, otimo in self.casos:
+            for configuracao in CONFIGURACOES:
+                for limite_nos, is_lower_bound in itertools.product(LIMITES_NOS, (False, True)):
+                    with self.subTest(grafo=nome, limite_nos=limite_nos, lb=is_lower_bound, **configuracao):
+                        solver = bb.Solver(is_lower_bound=is_lower_bound, is_upper_bound=True, limite_nos=limite_nos,
+                                           plotagem=None, **configuracao)
+                        solver.resolver(G, list(ordem))
+                        self.verificar(solver, G, otimo, completo=not solver.interrompido)
+
+    def test_lower_bound_heuristico_nao_certifica(self):
+        # Com o lower bound, a árvore termina com peso 8: o resultado não pode ser dado como ótimo
+        for motor in ('recursivo', 'iterativo', 'melhor_primeiro', 'paralelo'):
+            with self.subTest(motor=motor):
+                solver = bb.Solver(is_lower_bound=True, motor=motor, n_processos=2, plotagem=None)
+                solver.resolver(ARVORE_PODA_HEURISTICA, list(ORDEM_PODA_HEURISTICA))
+                if solver.melhor_peso != 7:
+                    self.assertFalse(solver.otimo_provado)
+                    if solver.limite_inferior is not None:
+                        self.assertLessEqual(solver.limite_inferior, 7)
+
+
+if __name__ == '__main__':
+    unittest.main()